@@ -0,0 +1,403 @@
+import argparse
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from search_index import fold_accents
+
+AUTHORS_FILENAME = "authors.json"
+PROFESSORS_FILENAME = "professors.json"
+
+# CSR arrays written as individual .npy files so that they can be opened with
+# np.load(..., mmap_mode="r") and shared between worker processes.
+ARRAY_NAMES = (
+    "production_indptr",  # production -> slice of production_authors
+    "production_authors",  # author IDs, grouped by production
+    "professor_indptr",  # professor -> slice of productions
+    "author_indptr",  # author -> slice of author_productions
+    "author_productions",  # production IDs, grouped by author
+    "self_indptr",  # professor -> slice of self_authors
+    "self_authors",  # author IDs of the professor's citation names
+)
+
+_SEPARATORS = re.compile(r"[\s.]")
+
+
+def normalize_author(name: str) -> str:
+    """
+    Normalizes an author string for interning ("Damasceno, A. C." -> "DAMASCENO,AC").
+
+    Mirrors `normalizar_nome_citacao` in notebook/utils_lattes.py: accents,
+    whitespace and dots are removed and the result is uppercased.
+
+    Args:
+        name (str): Raw author string.
+
+    Returns:
+        str: Normalized key.
+    """
+    return _SEPARATORS.sub("", fold_accents(name)).upper()
+
+
+class AuthorInterner:
+    """
+    Maps normalized author strings to dense integer IDs.
+    """
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.labels: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def intern(self, name: str) -> int:
+        """
+        Returns the ID of an author, assigning a new one if needed.
+
+        Args:
+            name (str): Raw author string; the first spelling seen is kept as
+                the display label.
+
+        Returns:
+            int: Author ID.
+        """
+        key = normalize_author(name)
+        author_id = self._ids.get(key)
+        if author_id is None:
+            author_id = len(self.keys)
+            self._ids[key] = author_id
+            self.keys.append(key)
+            self.labels.append(name.strip())
+        return author_id
+
+    def lookup(self, name: str) -> int | None:
+        """
+        Returns the ID of an author without interning it.
+
+        Args:
+            name (str): Raw author string.
+
+        Returns:
+            int | None: Author ID, or None if unknown.
+        """
+        return self._ids.get(normalize_author(name))
+
+
+def _csr(
+    groups: list[list[int]], dtype: type = np.int32
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Packs a list of integer lists into CSR (indptr, indices) arrays.
+
+    Args:
+        groups (list[list[int]]): One list per row.
+        dtype (type): Dtype of the indices. Defaults to int32.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: int64 indptr and indices.
+    """
+    indptr = np.zeros(len(groups) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(g) for g in groups])
+    indices = np.fromiter(
+        (value for group in groups for value in group), dtype=dtype, count=indptr[-1]
+    )
+    return indptr, indices
+
+
+def _invert(
+    indptr: np.ndarray, indices: np.ndarray, n_cols: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Transposes a CSR structure (e.g. production -> authors into author -> productions).
+
+    Args:
+        indptr (np.ndarray): Row pointers.
+        indices (np.ndarray): Column indices.
+        n_cols (int): Number of columns.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: indptr and indices of the transpose.
+    """
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    counts = np.bincount(indices, minlength=n_cols)
+    inverted_indptr = np.zeros(n_cols + 1, dtype=np.int64)
+    inverted_indptr[1:] = np.cumsum(counts)
+    return inverted_indptr, rows[order]
+
+
+@dataclass
+class AuthorshipArrays:
+    """
+    Interned authorship graph stored as CSR arrays.
+
+    Production IDs follow the order of `producao_bibliografica` within each
+    professor, professors following the order of the parsed JSON.
+    """
+
+    professors: list[str]
+    names: list[str]
+    author_keys: list[str]
+    author_labels: list[str]
+    production_indptr: np.ndarray
+    production_authors: np.ndarray
+    professor_indptr: np.ndarray
+    author_indptr: np.ndarray
+    author_productions: np.ndarray
+    self_indptr: np.ndarray
+    self_authors: np.ndarray
+    _key_index: dict[str, int] | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def build(cls, records: list[dict]) -> "AuthorshipArrays":
+        """
+        Interns every author of the records and builds the CSR arrays.
+
+        Args:
+            records (list[dict]): Records as produced by parse_profiles.py.
+
+        Returns:
+            AuthorshipArrays: The arrays.
+        """
+        interner = AuthorInterner()
+        productions: list[list[int]] = []
+        per_professor: list[int] = []
+        self_ids: list[list[int]] = []
+        for record in records:
+            producoes = record.get("producao_bibliografica", [])
+            per_professor.append(len(producoes))
+            for producao in producoes:
+                ids = [interner.intern(a) for a in producao.get("autores", [])]
+                productions.append(sorted(set(ids)))
+            self_ids.append(
+                sorted(
+                    {
+                        interner.intern(nome)
+                        for nome in record["identificacao"].get("nomes_citacao", [])
+                    }
+                )
+            )
+
+        production_indptr, production_authors = _csr(productions)
+        professor_indptr = np.zeros(len(records) + 1, dtype=np.int64)
+        professor_indptr[1:] = np.cumsum(per_professor)
+        author_indptr, author_productions = _invert(
+            production_indptr, production_authors, len(interner.keys)
+        )
+        self_indptr, self_authors = _csr(self_ids)
+        return cls(
+            professors=[
+                r["identificacao"].get("lattes_id") or r["identificacao"]["nome"]
+                for r in records
+            ],
+            names=[r["identificacao"]["nome"] for r in records],
+            author_keys=interner.keys,
+            author_labels=interner.labels,
+            production_indptr=production_indptr,
+            production_authors=production_authors,
+            professor_indptr=professor_indptr,
+            author_indptr=author_indptr,
+            author_productions=author_productions,
+            self_indptr=self_indptr,
+            self_authors=self_authors,
+        )
+
+    def save(self, output_dir: str) -> None:
+        """
+        Writes one .npy file per array plus JSON label tables.
+
+        Args:
+            output_dir (str): Destination directory.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(output_dir, f"{name}.npy"), getattr(self, name))
+        with open(
+            os.path.join(output_dir, AUTHORS_FILENAME), "w", encoding="utf-8"
+        ) as f:
+            json.dump(
+                {"keys": self.author_keys, "labels": self.author_labels},
+                f,
+                ensure_ascii=False,
+            )
+        with open(
+            os.path.join(output_dir, PROFESSORS_FILENAME), "w", encoding="utf-8"
+        ) as f:
+            json.dump(
+                {"professors": self.professors, "names": self.names},
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load(cls, output_dir: str, mmap: bool = True) -> "AuthorshipArrays":
+        """
+        Loads arrays written by `save`, memory-mapped by default.
+
+        Args:
+            output_dir (str): Directory containing the files.
+            mmap (bool): Open the arrays read-only with mmap. Defaults to True.
+
+        Returns:
+            AuthorshipArrays: The arrays.
+        """
+        mode = "r" if mmap else None
+        arrays = {
+            name: np.load(os.path.join(output_dir, f"{name}.npy"), mmap_mode=mode)
+            for name in ARRAY_NAMES
+        }
+        with open(os.path.join(output_dir, AUTHORS_FILENAME), encoding="utf-8") as f:
+            authors = json.load(f)
+        with open(os.path.join(output_dir, PROFESSORS_FILENAME), encoding="utf-8") as f:
+            professors = json.load(f)
+        return cls(
+            professors=professors["professors"],
+            names=professors["names"],
+            author_keys=authors["keys"],
+            author_labels=authors["labels"],
+            **arrays,
+        )
+
+    @property
+    def n_authors(self) -> int:
+        return len(self.author_keys)
+
+    def author_id(self, name: str) -> int | None:
+        """
+        Looks up the ID of an author string.
+
+        Args:
+            name (str): Raw author string.
+
+        Returns:
+            int | None: Author ID, or None if unknown.
+        """
+        if self._key_index is None:
+            self._key_index = {k: i for i, k in enumerate(self.author_keys)}
+        return self._key_index.get(normalize_author(name))
+
+    def professor_productions(self, row: int) -> np.ndarray:
+        """
+        Returns the production IDs of a professor.
+
+        Args:
+            row (int): Professor row.
+
+        Returns:
+            np.ndarray: Production IDs.
+        """
+        return np.arange(self.professor_indptr[row], self.professor_indptr[row + 1])
+
+    def coauthor_counts(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Counts the coauthors of a professor, excluding their own citation names.
+
+        Args:
+            row (int): Professor row.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Author IDs and number of shared
+            productions, sorted by decreasing count.
+        """
+        start = self.production_indptr[self.professor_indptr[row]]
+        stop = self.production_indptr[self.professor_indptr[row + 1]]
+        counts = np.bincount(
+            self.production_authors[start:stop], minlength=self.n_authors
+        )
+        own = self.self_authors[self.self_indptr[row] : self.self_indptr[row + 1]]
+        counts[own] = 0
+        ids = np.flatnonzero(counts)
+        order = np.argsort(-counts[ids], kind="stable")
+        return ids[order], counts[ids][order]
+
+    def productions_with(self, author_ids: np.ndarray | list[int]) -> np.ndarray:
+        """
+        Returns the productions that include any of the given authors.
+
+        Args:
+            author_ids (np.ndarray | list[int]): Author IDs.
+
+        Returns:
+            np.ndarray: Sorted unique production IDs.
+        """
+        parts = [
+            self.author_productions[self.author_indptr[a] : self.author_indptr[a + 1]]
+            for a in np.asarray(author_ids, dtype=np.int64)
+        ]
+        return (
+            np.unique(np.concatenate(parts)) if parts else np.array([], dtype=np.int32)
+        )
+
+    def ego_network(self, author_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the direct coauthors of an author with their edge weights.
+
+        Args:
+            author_id (int): Center of the ego network.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Neighbour author IDs and the number
+            of productions shared with the center.
+        """
+        productions = self.productions_with([author_id])
+        starts = self.production_indptr[productions]
+        stops = self.production_indptr[productions + 1]
+        lengths = stops - starts
+        # Positions of every author slot of those productions, without a loop
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        counts = np.bincount(
+            self.production_authors[positions], minlength=self.n_authors
+        )
+        counts[author_id] = 0
+        ids = np.flatnonzero(counts)
+        return ids, counts[ids]
+
+
+def default_output_dir(json_path: str) -> str:
+    """
+    Returns the directory placed next to a parsed JSON output.
+
+    Args:
+        json_path (str): Path of the JSON written by parse_profiles.py.
+
+    Returns:
+        str: e.g. "data/professores_autores" for "data/professores.json".
+    """
+    return os.path.splitext(json_path)[0] + "_autores"
+
+
+def main() -> None:
+    """
+    Command-line entry point: builds the interned authorship arrays.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Gera IDs inteiros de autores e arrays CSR de autoria (.npy)."
+    )
+    parser.add_argument("--input", required=True, help="JSON de professores.")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Diretório de saída (padrão: <input>_autores ao lado do JSON).",
+    )
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        records = json.load(f)
+    output_dir = args.output or default_output_dir(args.input)
+    arrays = AuthorshipArrays.build(records)
+    arrays.save(output_dir)
+    logging.info(
+        f"Autoria salva em '{output_dir}' ({arrays.n_authors} autores, "
+        f"{len(arrays.production_indptr) - 1} produções)."
+    )
+
+
+if __name__ == "__main__":
+    main()
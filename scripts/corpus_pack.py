@@ -0,0 +1,399 @@
+import argparse
+import csv
+import gzip
+import json
+import logging
+import os
+import re
+import struct
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+PACK_SUFFIX = ".pack"
+INDEX_SUFFIX = ".idx"
+
+# Entry layout: MAGIC | meta length (u32) | payload length (u32) | meta | payload
+MAGIC = b"LPK1"
+_HEADER = struct.Struct("<4sII")
+
+_LATTES_ID_PATTERN = re.compile(rb'color: #326C99;">\s*(\d{16})\s*<')
+# The photo URL carries the textual search code; trim_profile.py drops it.
+_SEARCH_CODE_PATTERN = re.compile(
+    rb"servletrecuperafoto\?[^\"']*?\bid=(K[0-9A-Z]{9})\b"
+)
+
+
+@dataclass
+class PackEntry:
+    key: str
+    nome: str
+    codigo: str
+    offset: int
+    length: int
+
+
+def is_pack(path: str) -> bool:
+    """
+    Tells whether a path points to a corpus pack file.
+
+    Args:
+        path (str): Path to check.
+
+    Returns:
+        bool: True if the path is an existing `.pack` file.
+    """
+    return os.path.isfile(path) and path.endswith(PACK_SUFFIX)
+
+
+def sniff_lattes_id(content: str | bytes) -> str | None:
+    """
+    Extracts the 16-digit Lattes ID from CV HTML without parsing it.
+
+    Args:
+        content (str | bytes): HTML content.
+
+    Returns:
+        str | None: The Lattes ID, or None if it is not present.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    match = _LATTES_ID_PATTERN.search(data)
+    return match.group(1).decode("ascii") if match else None
+
+
+def sniff_search_code(content: str | bytes) -> str | None:
+    """
+    Extracts the textual search code (K-code) from CV HTML without parsing it.
+
+    Args:
+        content (str | bytes): HTML content.
+
+    Returns:
+        str | None: The K-code, or None if it is not present.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    match = _SEARCH_CODE_PATTERN.search(data)
+    return match.group(1).decode("ascii") if match else None
+
+
+class CorpusPackWriter:
+    """
+    Appends gzip-compressed CV documents to a pack file and its index.
+
+    The pack and the JSON-lines index are only ever appended to; writing a key
+    that already exists shadows the previous entry (last write wins). `add` may
+    be called from several threads.
+    """
+
+    def __init__(self, path: str, compresslevel: int = 6) -> None:
+        self.path = path
+        self.compresslevel = compresslevel
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = _load_index(path) if os.path.exists(path) else {}
+        self._codigos = {e.codigo for e in self._entries.values() if e.codigo}
+        self._nomes = {e.nome for e in self._entries.values() if e.nome}
+        self._pack = open(path, "ab")
+        self._index = open(path + INDEX_SUFFIX, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "CorpusPackWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the pack and index files.
+        """
+        self._pack.close()
+        self._index.close()
+
+    def __contains__(self, key: str) -> bool:
+        # Packs converted from a directory may lack the K-code; the professor
+        # name (the legacy file name) still identifies their entries
+        return key in self._entries or key in self._codigos or key in self._nomes
+
+    def add(self, content: str, nome: str = "", codigo: str = "") -> PackEntry:
+        """
+        Compresses and appends one CV document.
+
+        The entry is keyed by the Lattes ID found in the content, falling back
+        to the textual search code when the ID cannot be sniffed.
+
+        Args:
+            content (str): CV HTML.
+            nome (str): Professor name. Defaults to "".
+            codigo (str): Textual search code (K-code). Defaults to "".
+
+        Returns:
+            PackEntry: The index entry of the written document.
+        """
+        key = sniff_lattes_id(content) or codigo or nome
+        meta = json.dumps(
+            {"key": key, "nome": nome, "codigo": codigo}, ensure_ascii=False
+        ).encode("utf-8")
+        payload = gzip.compress(
+            content.encode("utf-8"), compresslevel=self.compresslevel, mtime=0
+        )
+        with self._lock:
+            self._pack.seek(0, os.SEEK_END)
+            start = self._pack.tell()
+            self._pack.write(_HEADER.pack(MAGIC, len(meta), len(payload)))
+            self._pack.write(meta)
+            self._pack.write(payload)
+            self._pack.flush()
+
+            entry = PackEntry(
+                key=key,
+                nome=nome,
+                codigo=codigo,
+                offset=start + _HEADER.size + len(meta),
+                length=len(payload),
+            )
+            self._index.write(json.dumps(entry.__dict__, ensure_ascii=False) + "\n")
+            self._index.flush()
+            self._entries[key] = entry
+            if codigo:
+                self._codigos.add(codigo)
+            if nome:
+                self._nomes.add(nome)
+        return entry
+
+
+class CorpusPackReader:
+    """
+    Random-access and sequential reader for a pack file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries = _load_index(path)
+        self._pack = open(path, "rb")
+
+    def __enter__(self) -> "CorpusPackReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the underlying pack file.
+        """
+        self._pack.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def entries(self) -> list[PackEntry]:
+        """
+        Returns the live entries in pack order.
+
+        Returns:
+            list[PackEntry]: One entry per key (latest version).
+        """
+        return sorted(self._entries.values(), key=lambda entry: entry.offset)
+
+    def read(self, entry: PackEntry) -> str:
+        """
+        Seeks to an entry and decompresses it.
+
+        Args:
+            entry (PackEntry): Entry obtained from this reader.
+
+        Returns:
+            str: The CV HTML.
+        """
+        self._pack.seek(entry.offset)
+        return gzip.decompress(self._pack.read(entry.length)).decode("utf-8")
+
+    def get(self, key: str) -> str:
+        """
+        Returns the document stored under a Lattes ID (or fallback key).
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            str: The CV HTML.
+
+        Raises:
+            KeyError: If the key is not in the pack.
+        """
+        return self.read(self._entries[key])
+
+    def __iter__(self) -> Iterator[tuple[PackEntry, str]]:
+        for entry in self.entries():
+            yield entry, self.read(entry)
+
+
+def _scan_pack(path: str) -> Iterator[PackEntry]:
+    """
+    Walks the entry headers of a pack file.
+
+    Args:
+        path (str): Pack file path.
+
+    Yields:
+        PackEntry: Every entry, including shadowed ones, in file order.
+    """
+    with open(path, "rb") as f:
+        while True:
+            start = f.tell()
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            magic, meta_length, payload_length = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Pack corrompido em {path} (offset {start}).")
+            meta = json.loads(f.read(meta_length).decode("utf-8"))
+            offset = f.tell()
+            if offset + payload_length > os.fstat(f.fileno()).st_size:
+                logging.warning(
+                    f"Entrada truncada ignorada em {path} (offset {start})."
+                )
+                return
+            f.seek(payload_length, os.SEEK_CUR)
+            yield PackEntry(
+                key=meta["key"],
+                nome=meta["nome"],
+                codigo=meta["codigo"],
+                offset=offset,
+                length=payload_length,
+            )
+
+
+def _load_index(path: str) -> dict[str, PackEntry]:
+    """
+    Loads the index of a pack, rebuilding it from the pack if it is missing.
+
+    Args:
+        path (str): Pack file path.
+
+    Returns:
+        dict[str, PackEntry]: Latest entry per key.
+    """
+    index_path = path + INDEX_SUFFIX
+    entries: dict[str, PackEntry] = {}
+    if not os.path.exists(index_path):
+        for entry in _scan_pack(path):
+            entries[entry.key] = entry
+        with open(index_path, "w", encoding="utf-8") as f:
+            for entry in entries.values():
+                f.write(json.dumps(entry.__dict__, ensure_ascii=False) + "\n")
+        return entries
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = PackEntry(**json.loads(line))
+                entries[entry.key] = entry
+    return entries
+
+
+def load_codigos(csv_path: str) -> dict[str, str]:
+    """
+    Maps professor names to textual search codes (K-codes).
+
+    Args:
+        csv_path (str): CSV in the format of data/professores_ci.csv.
+
+    Returns:
+        dict[str, str]: Name -> K-code.
+    """
+    with open(csv_path, encoding="utf-8-sig") as f:
+        return {
+            row["Nome dos Professores"].strip(): row["Código(Busca Textual)"].strip()
+            for row in csv.DictReader(f)
+        }
+
+
+def convert_directory(
+    input_dir: str, output_path: str, codigos: dict[str, str] | None = None
+) -> int:
+    """
+    Packs every `.html` file of a directory (the legacy one-file-per-CV layout).
+
+    Args:
+        input_dir (str): Directory with HTML files named after professors.
+        output_path (str): Destination `.pack` file.
+        codigos (dict[str, str] | None): Name -> K-code (see `load_codigos`),
+            stored with each entry so that download_profile.py --pack skips
+            profiles already packed. Defaults to None.
+
+    Returns:
+        int: Number of documents written.
+    """
+    codigos = codigos or {}
+    html_files = sorted(f for f in os.listdir(input_dir) if f.endswith(".html"))
+    with CorpusPackWriter(output_path) as writer:
+        for filename in html_files:
+            nome = os.path.splitext(filename)[0]
+            if codigos and nome not in codigos:
+                logging.warning(f"Código de busca não encontrado para {nome}.")
+            with open(os.path.join(input_dir, filename), encoding="utf-8") as f:
+                writer.add(f.read(), nome=nome, codigo=codigos.get(nome, ""))
+    return len(html_files)
+
+
+def main() -> None:
+    """
+    Command-line entry point: converts, lists or extracts pack contents.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Pacote compactado de currículos Lattes com acesso aleatório."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert", help="Converte um diretório de HTMLs em pacote."
+    )
+    convert_parser.add_argument("--input", required=True, help="Diretório de HTMLs.")
+    convert_parser.add_argument("--output", required=True, help="Arquivo .pack.")
+    convert_parser.add_argument(
+        "--faculty",
+        default=None,
+        help="CSV de professores (ex.: data/professores_ci.csv) com os códigos de busca.",
+    )
+
+    list_parser = subparsers.add_parser("list", help="Lista as entradas do pacote.")
+    list_parser.add_argument("pack", help="Arquivo .pack.")
+
+    extract_parser = subparsers.add_parser("extract", help="Extrai um currículo.")
+    extract_parser.add_argument("pack", help="Arquivo .pack.")
+    extract_parser.add_argument("lattes_id", help="ID Lattes da entrada.")
+    extract_parser.add_argument("--output", help="Arquivo HTML de saída.")
+
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        codigos = load_codigos(args.faculty) if args.faculty else None
+        count = convert_directory(args.input, args.output, codigos)
+        logging.info(
+            f"{count} currículos empacotados em '{args.output}' "
+            f"({os.path.getsize(args.output) / 1024:.0f} KB)."
+        )
+    elif args.command == "list":
+        with CorpusPackReader(args.pack) as reader:
+            for entry in reader.entries():
+                print(f"{entry.key}\t{entry.length}\t{entry.nome}")
+    else:
+        with CorpusPackReader(args.pack) as reader:
+            content = reader.get(args.lattes_id)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(content)
+        else:
+            print(content)
+
+
+if __name__ == "__main__":
+    main()
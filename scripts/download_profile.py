@@ -3,11 +3,45 @@ import pandas as pd
 import os
 import argparse
 
+from corpus_pack import CorpusPackWriter
+from fetch_controller import AimdLimiter, CircuitBreaker, FetchController, RetryPolicy
+from sharding import parse_shard, shard_of, shard_path
+from trim_profile import trim_verified
+from validate_profile import quarantine_profile, validate_profile
 
-def salvar_div_como_html(page, arquivo: str, diretorio: str):
+LATTES_URL = "https://buscatextual.cnpq.br/buscatextual/preview.do"
+TIMEOUT_MS = 20000
+
+
+class PerfilInvalidoError(Exception):
+    def __init__(self, motivo: str, conteudo: str):
+        super().__init__(f"Currículo inválido ({motivo})")
+        self.motivo = motivo
+        self.conteudo = conteudo
+
+
+def capturar_div(page, reduzir: bool = False, timeout: int = TIMEOUT_MS) -> str:
     # Aguarda o seletor da div e pega o conteúdo HTML
-    page.wait_for_selector("xpath=/html/body/div[1]/div[3]/div/div/div", timeout=20000)
+    page.wait_for_selector(
+        "xpath=/html/body/div[1]/div[3]/div/div/div", timeout=timeout
+    )
     conteudo = page.inner_html("xpath=/html/body/div[1]/div[3]/div/div/div")
+    # Rejeita páginas de erro, captchas e capturas truncadas antes de salvar
+    validacao = validate_profile(conteudo)
+    if not validacao.ok:
+        raise PerfilInvalidoError(validacao.reason, conteudo)
+    # Mantém apenas as seções lidas pelo parser, se a extração não mudar
+    return trim_verified(conteudo) if reduzir else conteudo
+
+
+def salvar_div_como_html(
+    page,
+    arquivo: str,
+    diretorio: str,
+    reduzir: bool = False,
+    timeout: int = TIMEOUT_MS,
+):
+    conteudo = capturar_div(page, reduzir, timeout)
     os.makedirs(diretorio, exist_ok=True)
     arquivo_final = os.path.join(diretorio, arquivo)
     if not os.path.isfile(arquivo_final):
@@ -16,26 +50,57 @@ def salvar_div_como_html(page, arquivo: str, diretorio: str):
         print(f"Conteúdo salvo em {arquivo_final}")
 
 
-def run(playwright: Playwright, url: str, output: str, diretorio: str):
+def salvar_div_no_pacote(
+    page,
+    pacote: CorpusPackWriter,
+    nome: str,
+    codigo: str,
+    reduzir: bool = False,
+    timeout: int = TIMEOUT_MS,
+):
+    # Anexa o conteúdo HTML compactado ao pacote
+    conteudo = capturar_div(page, reduzir, timeout)
+    entrada = pacote.add(conteudo, nome=nome, codigo=codigo)
+    print(f"Conteúdo salvo em {pacote.path} (chave {entrada.key})")
+
+
+def run(
+    playwright: Playwright,
+    url: str,
+    output: str,
+    diretorio: str,
+    pacote: CorpusPackWriter | None = None,
+    codigo: str = "",
+    reduzir: bool = False,
+    timeout: int = TIMEOUT_MS,
+):
     chromium = playwright.chromium
     browser = chromium.launch(headless=True)
-    page = browser.new_page()
-    page.goto(url)
-    print("Página inicial acessada.")
-    page.wait_for_selector(
-        'xpath=//*[@id="id_form_previw"]/div/div/div[2]/div/div/div/div[2]/ul/li[1]/a',
-        timeout=20000,
-    )
-
-    with page.expect_popup() as new_page_info:
-        page.click(
-            'xpath=//*[@id="id_form_previw"]/div/div/div[2]/div/div/div/div[2]/ul/li[1]/a'
+    # Fecha o navegador mesmo se a página expirar ou for rejeitada
+    try:
+        page = browser.new_page()
+        page.goto(url, timeout=timeout)
+        print("Página inicial acessada.")
+        page.wait_for_selector(
+            'xpath=//*[@id="id_form_previw"]/div/div/div[2]/div/div/div/div[2]/ul/li[1]/a',
+            timeout=timeout,
         )
-    new_page = new_page_info.value
-    new_page.wait_for_load_state("load")
-    print("Nova página aberta.")
-    salvar_div_como_html(new_page, output, diretorio)
-    browser.close()
+
+        with page.expect_popup(timeout=timeout) as new_page_info:
+            page.click(
+                'xpath=//*[@id="id_form_previw"]/div/div/div[2]/div/div/div/div[2]/ul/li[1]/a'
+            )
+        new_page = new_page_info.value
+        new_page.wait_for_load_state("load", timeout=timeout)
+        print("Nova página aberta.")
+        if pacote is not None:
+            salvar_div_no_pacote(
+                new_page, pacote, os.path.splitext(output)[0], codigo, reduzir, timeout
+            )
+        else:
+            salvar_div_como_html(new_page, output, diretorio, reduzir, timeout)
+    finally:
+        browser.close()
 
 
 def main():
@@ -43,7 +108,11 @@ def main():
         description="Download profiles from Lattes platform"
     )
     parser.add_argument(
-        "--input", "-i", required=True, help="CSV file with professors data"
+        "--input",
+        "-i",
+        required=True,
+        nargs="+",
+        help="CSV file(s) with professors data",
     )
     parser.add_argument(
         "--output",
@@ -51,18 +120,127 @@ def main():
         default="perfis",
         help="Output directory for downloaded profiles (default: perfis)",
     )
+    parser.add_argument(
+        "--pack",
+        "-p",
+        default=None,
+        help="Append profiles to this compressed .pack file instead of --output",
+    )
+    parser.add_argument(
+        "--trim",
+        action="store_true",
+        help="Keep only the CV sections read by parse_profiles.py",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Extra attempts for failed or rejected profiles (default: 2)",
+    )
+    parser.add_argument(
+        "--quarantine",
+        default="quarentena",
+        help="Directory for rejected captures (default: quarentena)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT_MS / 1000,
+        help="Timeout of each page operation, in seconds (default: 20)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum simultaneous downloads; the actual limit adapts (default: 4)",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="JSON-lines file receiving the outcome of each profile",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=LATTES_URL,
+        help="Preview page URL (e.g. a local lattes_stub_server.py for testing)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help=(
+            "Download only shard i/N of the profiles, by hash of the search "
+            "code (K-code); parse_profiles.py --shard i/N selects the same "
+            "profiles. --output/--pack get a .shard-i-of-N suffix"
+        ),
+    )
 
     args = parser.parse_args()
 
-    df = pd.read_csv(args.input)
+    df = pd.concat([pd.read_csv(path) for path in args.input], ignore_index=True)
+    df = df.drop_duplicates(subset="Código(Busca Textual)")
+    if args.shard is not None:
+        indice, total = args.shard
+        df = df[df["Código(Busca Textual)"].map(lambda c: shard_of(c, total) == indice)]
+        args.output = shard_path(args.output, indice, total)
+        if args.pack:
+            args.pack = shard_path(args.pack, indice, total)
+    pacote = CorpusPackWriter(args.pack) if args.pack else None
+    timeout = int(args.timeout * 1000)
 
+    nomes = {}
     for idx, linha in df.iterrows():
         codigo = linha["Código(Busca Textual)"]
         nome = linha["Nome dos Professores"]
-        url = f"https://buscatextual.cnpq.br/buscatextual/preview.do?metodo=apresentar&id={codigo}"
-        print(idx, url)
-        with sync_playwright() as playwright:
-            run(playwright, url, nome + ".html", args.output)
+        if pacote is not None and (codigo in pacote or nome in pacote):
+            print(idx, f"{nome} já está no pacote, ignorando.")
+            continue
+        if pacote is None and os.path.isfile(os.path.join(args.output, nome + ".html")):
+            print(idx, f"{nome} já foi baixado, ignorando.")
+            continue
+        nomes[codigo] = nome
+
+    def baixar(codigo: str):
+        nome = nomes[codigo]
+        url = f"{args.base_url}?metodo=apresentar&id={codigo}"
+        print(url)
+        try:
+            with sync_playwright() as playwright:
+                run(
+                    playwright,
+                    url,
+                    nome + ".html",
+                    args.output,
+                    pacote,
+                    codigo,
+                    args.trim,
+                    timeout,
+                )
+        except PerfilInvalidoError as e:
+            quarantine_profile(e.conteudo, nome, e.motivo, args.quarantine)
+            raise
+
+    controller = FetchController(
+        baixar,
+        retry=RetryPolicy(max_attempts=args.retries + 1),
+        breaker=CircuitBreaker(),
+        limiter=AimdLimiter(
+            initial=min(2, args.concurrency),
+            maximum=args.concurrency,
+            slow_threshold=args.timeout / 2,
+        ),
+    )
+    try:
+        resultados = controller.run(list(nomes), args.report)
+    finally:
+        if pacote is not None:
+            pacote.close()
+    for resultado in resultados:
+        if not resultado.ok:
+            print(
+                f"Falha em {nomes[resultado.key]} após "
+                f"{resultado.attempts} tentativas: {resultado.error}"
+            )
 
 
 if __name__ == "__main__":
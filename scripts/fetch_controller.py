@@ -0,0 +1,300 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+@dataclass
+class FetchOutcome:
+    key: str
+    ok: bool
+    attempts: int
+    elapsed: float
+    error: str | None = None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter: attempt n waits about base_delay * 2**(n-1).
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        """
+        Returns the wait before retrying after the given failed attempt.
+
+        Args:
+            attempt (int): Number of the attempt that failed (1-based).
+            rng (random.Random): Source of the jitter.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * rng.random())
+
+
+class CircuitBreaker:
+    """
+    Stops all requests after consecutive failures, then probes the server.
+
+    After `failure_threshold` consecutive failures the breaker opens and no
+    request is allowed for `reset_timeout` seconds. It then lets a single probe
+    through (half-open): a success closes it, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.state = BREAKER_CLOSED
+
+    def before_call(self) -> float:
+        """
+        Asks permission for a request.
+
+        Returns:
+            float: 0 if the request may proceed now, otherwise the number of
+            seconds to wait before asking again.
+        """
+        with self._lock:
+            if self.state == BREAKER_CLOSED:
+                return 0.0
+            if self.state == BREAKER_OPEN:
+                remaining = self._opened_at + self.reset_timeout - self._clock()
+                if remaining > 0:
+                    return remaining
+                self.state = BREAKER_HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return min(1.0, self.reset_timeout)
+            self._probing = True
+            return 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != BREAKER_CLOSED:
+                logging.info("Circuito fechado: servidor respondendo novamente.")
+            self.state = BREAKER_CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self.state == BREAKER_HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self.state != BREAKER_OPEN:
+                    logging.warning(
+                        f"Circuito aberto após {self._failures} falhas; "
+                        f"pausando por {self.reset_timeout:.0f} s."
+                    )
+                self.state = BREAKER_OPEN
+                self._opened_at = self._clock()
+
+
+class AimdLimiter:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    Each fast success raises the limit by `increase / limit` (about +`increase`
+    per full window of requests); a failure, or a success slower than
+    `slow_threshold`, multiplies it by `decrease`. Only requests started after
+    the last decrease can trigger another one, so a burst of failures from the
+    same window shrinks the limit once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2,
+        minimum: float = 1,
+        maximum: float = 8,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        slow_threshold: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_threshold = slow_threshold
+        self._clock = clock
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request slot is free.
+
+        Returns:
+            float: Start time of the request, to be passed to `release`.
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, started: float, success: bool) -> None:
+        """
+        Frees a slot and adapts the limit to the request's result.
+
+        Args:
+            started (float): Value returned by `acquire`.
+            success (bool): Whether the request succeeded.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = self._clock()
+            slow = (
+                self.slow_threshold is not None and now - started > self.slow_threshold
+            )
+            if success and not slow:
+                self._limit = min(
+                    self.maximum, self._limit + self.increase / self._limit
+                )
+            elif started >= self._last_decrease:
+                self._limit = max(self.minimum, self._limit * self.decrease)
+                self._last_decrease = now
+            self._condition.notify_all()
+
+
+class FetchController:
+    """
+    Runs a fetch function over many keys with retries, a circuit breaker and
+    adaptive concurrency.
+
+    The fetch function receives a key and either returns (success) or raises.
+    Exceptions listed in `retry_on` are retried with backoff; any other
+    exception fails the key immediately. Every key yields a FetchOutcome, so
+    one bad profile never aborts the whole run.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], object],
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        limiter: AimdLimiter | None = None,
+        retry_on: tuple[type[BaseException], ...] = (Exception,),
+        seed: int | None = None,
+    ) -> None:
+        self.fetch = fetch
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or AimdLimiter()
+        self.retry_on = retry_on
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _wait_for_breaker(self) -> None:
+        while (wait := self.breaker.before_call()) > 0:
+            time.sleep(wait)
+
+    def fetch_one(self, key: str) -> FetchOutcome:
+        """
+        Fetches one key, retrying until it succeeds or attempts run out.
+
+        Args:
+            key (str): Key passed to the fetch function.
+
+        Returns:
+            FetchOutcome: Result of the key.
+        """
+        started = time.monotonic()
+        error = None
+        for attempt in range(1, self.retry.max_attempts + 1):
+            self._wait_for_breaker()
+            slot = self.limiter.acquire()
+            try:
+                self.fetch(key)
+            except Exception as e:
+                self.limiter.release(slot, success=False)
+                self.breaker.record_failure()
+                error = f"{type(e).__name__}: {e}"
+                logging.warning(f"{key}: tentativa {attempt} falhou ({error}).")
+                if not isinstance(e, self.retry_on):
+                    break
+                if attempt < self.retry.max_attempts:
+                    with self._rng_lock:
+                        delay = self.retry.delay(attempt, self._rng)
+                    time.sleep(delay)
+                continue
+            self.limiter.release(slot, success=True)
+            self.breaker.record_success()
+            return FetchOutcome(key, True, attempt, time.monotonic() - started)
+        return FetchOutcome(key, False, attempt, time.monotonic() - started, error)
+
+    def run(
+        self, keys: Iterable[str], report_path: str | None = None
+    ) -> list[FetchOutcome]:
+        """
+        Fetches every key concurrently, within the adaptive limit.
+
+        Args:
+            keys (Iterable[str]): Keys to fetch.
+            report_path (str | None): JSON-lines file that receives one line
+                per outcome as keys finish. Defaults to None.
+
+        Returns:
+            list[FetchOutcome]: Outcomes, in the order of `keys`.
+        """
+        report = open(report_path, "a", encoding="utf-8") if report_path else None
+        report_lock = threading.Lock()
+
+        def task(key: str) -> FetchOutcome:
+            outcome = self.fetch_one(key)
+            if report is not None:
+                entry = asdict(outcome)
+                entry["timestamp"] = datetime.now(UTC).isoformat()
+                with report_lock:
+                    report.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    report.flush()
+            return outcome
+
+        try:
+            with ThreadPoolExecutor(max_workers=int(self.limiter.maximum)) as pool:
+                outcomes = list(pool.map(task, keys))
+        finally:
+            if report is not None:
+                report.close()
+
+        failed = sum(not o.ok for o in outcomes)
+        logging.info(
+            f"{len(outcomes) - failed} perfis obtidos, {failed} falhas "
+            f"(limite de concorrência final: {self.limiter.limit:.1f})."
+        )
+        return outcomes
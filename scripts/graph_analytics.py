@@ -0,0 +1,378 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+from dataclasses import asdict, dataclass
+
+import networkx as nx
+from community import community_louvain
+
+from author_index import normalize_author
+
+LATEST_FILENAME = "latest.json"
+
+# Above this many nodes, betweenness and closeness are estimated from a sample
+# of pivot nodes instead of running one BFS per node.
+EXACT_CENTRALITY_LIMIT = 1000
+DEFAULT_SAMPLES = 256
+DEFAULT_SEED = 42
+
+
+@dataclass
+class GraphAnalysis:
+    fingerprint: str
+    params: dict
+    partition: dict[str, int]
+    modularity: float
+    betweenness: dict[str, float]
+    closeness: dict[str, float]
+    # Whether Louvain started from a cached partition (centralities never do)
+    warm_start: bool = False
+
+
+def build_coauthorship_graph(records: list[dict]) -> nx.Graph:
+    """
+    Builds the professor-coauthor graph used in the notebook analyses.
+
+    Coauthor strings matching a professor's citation names are mapped to that
+    professor; the remaining ones are merged by normalized name. Edge weights
+    count the productions listing both ends.
+
+    Args:
+        records (list[dict]): Records as produced by parse_profiles.py.
+
+    Returns:
+        nx.Graph: Weighted undirected graph; nodes carry a `professor` flag.
+    """
+    citacao_para_nome: dict[str, str] = {}
+    for record in records:
+        nome = record["identificacao"]["nome"]
+        for citacao in record["identificacao"].get("nomes_citacao", []):
+            citacao_para_nome.setdefault(normalize_author(citacao), nome)
+
+    graph = nx.Graph()
+    for record in records:
+        nome = record["identificacao"]["nome"]
+        graph.add_node(nome, professor=True)
+        for producao in record.get("producao_bibliografica", []):
+            coautores = set()
+            for autor in producao.get("autores", []):
+                key = normalize_author(autor)
+                coautor = citacao_para_nome.setdefault(key, autor.strip())
+                if coautor != nome:
+                    coautores.add(coautor)
+            for coautor in coautores:
+                if coautor not in graph:
+                    graph.add_node(coautor, professor=False)
+                if graph.has_edge(nome, coautor):
+                    graph[nome][coautor]["weight"] += 1
+                else:
+                    graph.add_edge(nome, coautor, weight=1)
+    return graph
+
+
+def graph_fingerprint(graph: nx.Graph) -> str:
+    """
+    Hashes the node set and the weighted edge set of a graph.
+
+    Args:
+        graph (nx.Graph): Graph with string nodes.
+
+    Returns:
+        str: Hex SHA-256 digest, independent of insertion order.
+    """
+    digest = hashlib.sha256()
+    for node in sorted(graph.nodes):
+        digest.update(node.encode("utf-8") + b"\0")
+    digest.update(b"\1")
+    edges = sorted(
+        (min(u, v), max(u, v), data.get("weight", 1))
+        for u, v, data in graph.edges(data=True)
+    )
+    for u, v, weight in edges:
+        digest.update(f"{u}\0{v}\0{weight}\n".encode())
+    return digest.hexdigest()
+
+
+def detect_communities(
+    graph: nx.Graph,
+    previous: dict[str, int] | None = None,
+    resolution: float = 1.0,
+    seed: int = DEFAULT_SEED,
+) -> dict[str, int]:
+    """
+    Runs Louvain, optionally starting from a previous partition.
+
+    Nodes absent from `previous` start in singleton communities, and nodes
+    that no longer exist are dropped, so a partition computed before a small
+    data refresh converges in a few passes.
+
+    Args:
+        graph (nx.Graph): Weighted graph.
+        previous (dict[str, int] | None): Earlier partition. Defaults to None.
+        resolution (float): Louvain resolution. Defaults to 1.0.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        dict[str, int]: Community of each node.
+    """
+    initial = None
+    if previous:
+        initial = {node: previous[node] for node in graph if node in previous}
+        next_id = max(initial.values(), default=-1) + 1
+        for node in graph:
+            if node not in initial:
+                initial[node] = next_id
+                next_id += 1
+    return community_louvain.best_partition(
+        graph,
+        partition=initial,
+        weight="weight",
+        resolution=resolution,
+        random_state=seed,
+    )
+
+
+def approximate_betweenness(
+    graph: nx.Graph, samples: int = DEFAULT_SAMPLES, seed: int = DEFAULT_SEED
+) -> dict[str, float]:
+    """
+    Computes betweenness centrality, sampling pivots on large graphs.
+
+    Args:
+        graph (nx.Graph): Graph (edges treated as unweighted).
+        samples (int): Pivot nodes used above EXACT_CENTRALITY_LIMIT nodes.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        dict[str, float]: Normalized betweenness of each node.
+    """
+    n_nodes = graph.number_of_nodes()
+    k = None if n_nodes <= EXACT_CENTRALITY_LIMIT else min(samples, n_nodes)
+    return nx.betweenness_centrality(graph, k=k, normalized=True, seed=seed)
+
+
+def approximate_closeness(
+    graph: nx.Graph, samples: int = DEFAULT_SAMPLES, seed: int = DEFAULT_SEED
+) -> dict[str, float]:
+    """
+    Computes closeness centrality, sampling pivots on large components.
+
+    Each component with more than `samples` nodes uses the Eppstein-Wang
+    estimator: the mean distance of a node is estimated from BFS distances to
+    `samples` random pivots of its component. Smaller components are solved
+    exactly. Values use the same Wasserman-Faust scaling as
+    nx.closeness_centrality, so both are comparable.
+
+    Args:
+        graph (nx.Graph): Graph (edges treated as unweighted).
+        samples (int): Pivots per large component.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        dict[str, float]: Closeness of each node.
+    """
+    n_nodes = graph.number_of_nodes()
+    if n_nodes <= EXACT_CENTRALITY_LIMIT:
+        return nx.closeness_centrality(graph)
+
+    rng = random.Random(seed)
+    closeness: dict[str, float] = {}
+    for component in nx.connected_components(graph):
+        size = len(component)
+        if size == 1:
+            closeness[next(iter(component))] = 0.0
+            continue
+        exact = size <= samples
+        pivots = component if exact else rng.sample(sorted(component), samples)
+        totals = dict.fromkeys(component, 0)
+        for pivot in pivots:
+            for node, distance in nx.single_source_shortest_path_length(
+                graph, pivot
+            ).items():
+                totals[node] += distance
+        scale = (size - 1) / (n_nodes - 1)
+        for node, total in totals.items():
+            # Mean distance to the other nodes of the component
+            mean = (
+                total / (size - 1) if exact else total * size / (samples * (size - 1))
+            )
+            closeness[node] = scale / mean if mean > 0 else 0.0
+    return closeness
+
+
+class AnalysisCache:
+    """
+    Stores graph analyses on disk, one JSON file per graph fingerprint.
+
+    The most recently computed analysis is also recorded in LATEST_FILENAME,
+    so that after a refresh changes the graph its partition can seed Louvain.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, f"{fingerprint}.json")
+
+    def _read(self, path: str) -> GraphAnalysis | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return GraphAnalysis(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def get(self, fingerprint: str) -> GraphAnalysis | None:
+        """
+        Returns the cached analysis of a graph.
+
+        Args:
+            fingerprint (str): Graph fingerprint.
+
+        Returns:
+            GraphAnalysis | None: The analysis, or None if not cached.
+        """
+        return self._read(self._path(fingerprint))
+
+    def latest(self) -> GraphAnalysis | None:
+        """
+        Returns the most recently stored analysis, whatever its graph.
+
+        Returns:
+            GraphAnalysis | None: The analysis, or None if the cache is empty.
+        """
+        try:
+            with open(
+                os.path.join(self.cache_dir, LATEST_FILENAME), encoding="utf-8"
+            ) as f:
+                fingerprint = json.load(f)["fingerprint"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return self.get(fingerprint)
+
+    def put(self, analysis: GraphAnalysis) -> None:
+        """
+        Stores an analysis and marks it as the latest.
+
+        Args:
+            analysis (GraphAnalysis): Analysis to store.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(analysis.fingerprint)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(asdict(analysis), f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+        latest = os.path.join(self.cache_dir, LATEST_FILENAME)
+        with open(latest + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": analysis.fingerprint}, f)
+        os.replace(latest + ".tmp", latest)
+
+
+def analyze_graph(
+    graph: nx.Graph,
+    cache_dir: str | None = None,
+    samples: int = DEFAULT_SAMPLES,
+    resolution: float = 1.0,
+    seed: int = DEFAULT_SEED,
+) -> GraphAnalysis:
+    """
+    Computes communities and centralities, reusing cached results when possible.
+
+    An analysis cached for the same graph and parameters is returned as is.
+    Otherwise only community detection is warm-started: Louvain starts from
+    the latest cached partition. Betweenness and closeness are always
+    recomputed from scratch (sampled on large graphs). Nearly every node of
+    the coauthorship graph is in one component, so no untouched component
+    could keep its values, and after an update a warm run takes about as
+    long as a cold one.
+
+    Args:
+        graph (nx.Graph): Coauthorship graph.
+        cache_dir (str | None): Cache directory. Defaults to no caching.
+        samples (int): Pivot nodes for the centrality approximations.
+        resolution (float): Louvain resolution. Defaults to 1.0.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        GraphAnalysis: The analysis.
+    """
+    params = {"samples": samples, "resolution": resolution, "seed": seed}
+    fingerprint = graph_fingerprint(graph)
+    cache = AnalysisCache(cache_dir) if cache_dir else None
+
+    previous = None
+    if cache is not None:
+        cached = cache.get(fingerprint)
+        if cached is not None and cached.params == params:
+            return cached
+        previous = cache.latest()
+
+    partition = detect_communities(
+        graph,
+        previous.partition if previous else None,
+        resolution=resolution,
+        seed=seed,
+    )
+    analysis = GraphAnalysis(
+        fingerprint=fingerprint,
+        params=params,
+        partition=partition,
+        modularity=community_louvain.modularity(partition, graph, weight="weight"),
+        betweenness=approximate_betweenness(graph, samples, seed),
+        closeness=approximate_closeness(graph, samples, seed),
+        warm_start=previous is not None,
+    )
+    if cache is not None:
+        cache.put(analysis)
+    return analysis
+
+
+def main() -> None:
+    """
+    Command-line entry point: analyzes the coauthorship graph of a JSON output.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Detecta comunidades (Louvain) e calcula centralidades da rede de "
+            "coautoria, com cache por impressão digital do grafo."
+        )
+    )
+    parser.add_argument("--input", required=True, help="JSON de professores.")
+    parser.add_argument("--cache", required=True, help="Diretório de cache.")
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=DEFAULT_SAMPLES,
+        help="Nós-pivô usados nas centralidades aproximadas.",
+    )
+    parser.add_argument("--resolution", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--top", type=int, default=10, help="Nós exibidos.")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        records = json.load(f)
+    graph = build_coauthorship_graph(records)
+    analysis = analyze_graph(
+        graph, args.cache, args.samples, args.resolution, args.seed
+    )
+    logging.info(
+        f"{graph.number_of_nodes()} nós, {graph.number_of_edges()} arestas, "
+        f"{len(set(analysis.partition.values()))} comunidades "
+        f"(modularidade {analysis.modularity:.3f})."
+    )
+    top = sorted(analysis.betweenness, key=analysis.betweenness.get, reverse=True)
+    for node in top[: args.top]:
+        print(
+            f"{analysis.betweenness[node]:.4f}  {analysis.closeness[node]:.4f}  "
+            f"[{analysis.partition[node]}] {node}"
+        )
+
+
+if __name__ == "__main__":
+    main()
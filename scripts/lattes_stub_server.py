@@ -0,0 +1,198 @@
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+DEFAULT_PORT = 8766
+PREVIEW_PATH = "/buscatextual/preview.do"
+CV_PATH = "/buscatextual/visualizacv.do"
+
+# Same nesting as the real preview page, so that the XPath used by
+# download_profile.run() finds the link that opens the CV.
+PREVIEW_TEMPLATE = """<html><body>
+<form id="id_form_previw"><div><div><div></div><div><div><div>
+<div></div><div><ul><li><a href="{cv_url}" target="_blank">Currículo</a></li></ul></div>
+</div></div></div></div></div></form>
+</body></html>"""
+
+# body/div[1]/div[3]/div/div/div holds the CV, as on the real CV page.
+CV_TEMPLATE = """<html><body><div><div></div><div></div><div><div><div>
+<div>{content}</div>
+</div></div></div></div></body></html>"""
+
+CAPTCHA_PAGE = """<html><body><div><div></div><div></div><div><div><div><div>
+<p>Digite o texto da imagem (captcha) para continuar.</p>
+</div></div></div></div></div></body></html>"""
+
+
+@dataclass
+class FaultConfig:
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    captcha_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+    seed: int | None = None
+
+
+def load_profiles(csv_path: str, profiles_dir: str) -> dict[str, str]:
+    """
+    Maps textual search codes to the bundled CV files of a faculty list.
+
+    Args:
+        csv_path (str): CSV in the format of data/professores_ci.csv.
+        profiles_dir (str): Directory with "<Nome>.html" files.
+
+    Returns:
+        dict[str, str]: K-code -> path of the CV file, for files that exist.
+    """
+    df = pd.read_csv(csv_path)
+    profiles = {}
+    for _, linha in df.iterrows():
+        path = os.path.join(profiles_dir, linha["Nome dos Professores"] + ".html")
+        if os.path.isfile(path):
+            profiles[linha["Código(Busca Textual)"]] = path
+    return profiles
+
+
+def make_server(
+    profiles: dict[str, str],
+    faults: FaultConfig,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+) -> ThreadingHTTPServer:
+    """
+    Builds a stand-in for buscatextual.cnpq.br that injects latency and faults.
+
+    Every request is delayed by `latency` plus up to `jitter` seconds. CV
+    requests then fail with HTTP 503 with probability `failure_rate`, return a
+    captcha page with probability `captcha_rate`, or stall for `hang_seconds`
+    (so the client times out) with probability `hang_rate`.
+
+    Args:
+        profiles (dict[str, str]): K-code -> CV file, see `load_profiles`.
+        faults (FaultConfig): Injected latency and fault probabilities.
+        host (str): Listening address. Defaults to 127.0.0.1.
+        port (int): Listening port (0 picks a free one). Defaults to DEFAULT_PORT.
+
+    Returns:
+        ThreadingHTTPServer: The server, not yet started.
+    """
+    rng = random.Random(faults.seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_html(self, status: HTTPStatus, html: str) -> None:
+            body = html.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up waiting (e.g. after an injected hang)
+                logging.debug(f"Cliente desconectado: {self.path}")
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            codigo = parse_qs(url.query).get("id", [""])[0]
+            with rng_lock:
+                delay = faults.latency + faults.jitter * rng.random()
+                draw = rng.random()
+            time.sleep(delay)
+
+            if url.path == PREVIEW_PATH:
+                self._send_html(
+                    HTTPStatus.OK,
+                    PREVIEW_TEMPLATE.format(cv_url=f"{CV_PATH}?id={codigo}"),
+                )
+                return
+            if url.path != CV_PATH or codigo not in profiles:
+                self._send_html(HTTPStatus.NOT_FOUND, "<html><body></body></html>")
+                return
+
+            if draw < faults.failure_rate:
+                self._send_html(HTTPStatus.SERVICE_UNAVAILABLE, "<html></html>")
+                return
+            draw -= faults.failure_rate
+            if draw < faults.captcha_rate:
+                self._send_html(HTTPStatus.OK, CAPTCHA_PAGE)
+                return
+            draw -= faults.captcha_rate
+            if draw < faults.hang_rate:
+                time.sleep(faults.hang_seconds)
+
+            with open(profiles[codigo], encoding="utf-8") as f:
+                content = f.read()
+            self._send_html(HTTPStatus.OK, CV_TEMPLATE.format(content=content))
+
+        def log_message(self, format: str, *args: object) -> None:
+            logging.debug(format % args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> None:
+    """
+    Command-line entry point: serves the bundled CVs with injected faults.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Servidor local que imita a busca textual do Lattes, com latência "
+            "e falhas injetadas, para testar download_profile.py."
+        )
+    )
+    parser.add_argument("--input", required=True, help="CSV de professores.")
+    parser.add_argument(
+        "--profiles", required=True, help="Diretório com os HTMLs servidos."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso (s).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Atraso extra (s).")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="HTTP 503.")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="Captcha.")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Travamentos.")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profiles = load_profiles(args.input, args.profiles)
+    faults = FaultConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        captcha_rate=args.captcha_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+    server = make_server(profiles, faults, args.host, args.port)
+    host, port = server.server_address[:2]
+    logging.info(
+        f"{len(profiles)} currículos em http://{host}:{port}{PREVIEW_PATH} "
+        "(use --base-url em download_profile.py)."
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Encerrando...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
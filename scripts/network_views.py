@@ -0,0 +1,535 @@
+import argparse
+import functools
+import importlib.util
+import json
+import logging
+import os
+import types
+from dataclasses import asdict, dataclass
+
+import networkx as nx
+
+from graph_analytics import DEFAULT_SEED, build_coauthorship_graph, graph_fingerprint
+from production_cube import load_labs
+from search_index import fold_accents
+
+LATEST_FILENAME = "latest.json"
+# Labels are wrapped with the notebook's own helper, so exported views match
+# the labels of the existing visualizations
+NOTEBOOK_UTILS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "notebook", "utils_lattes.py"
+)
+
+# pyvis places nodes in pixels; layouts are scaled to this half-width.
+LAYOUT_SCALE = 1000.0
+LAYOUT_ITERATIONS = 50
+LABEL_WIDTH = 18
+DEFAULT_K_CORE = 2
+DEFAULT_TOP_EDGES = 500
+UNASSIGNED_LAB = "Sem laboratório"
+
+
+@dataclass
+class NetworkView:
+    name: str
+    fingerprint: str
+    params: dict
+    nodes: list[dict]
+    edges: list[dict]
+
+
+def k_core_view(graph: nx.Graph, k: int = DEFAULT_K_CORE) -> nx.Graph:
+    """
+    Keeps the maximal subgraph in which every node has at least k neighbors.
+
+    Drops the long tail of coauthors who appear in a single production with
+    a single professor, which is most of the nodes of the full network.
+
+    Args:
+        graph (nx.Graph): Coauthorship graph.
+        k (int): Minimum degree. Defaults to DEFAULT_K_CORE.
+
+    Returns:
+        nx.Graph: The k-core (a copy).
+    """
+    graph = graph.copy()
+    graph.remove_edges_from(nx.selfloop_edges(graph))
+    return nx.k_core(graph, k).copy()
+
+
+def top_edges_view(graph: nx.Graph, n: int = DEFAULT_TOP_EDGES) -> nx.Graph:
+    """
+    Keeps the n heaviest edges and the nodes they connect.
+
+    Ties are broken by node names, so the result does not depend on the
+    insertion order of the graph.
+
+    Args:
+        graph (nx.Graph): Coauthorship graph.
+        n (int): Number of edges. Defaults to DEFAULT_TOP_EDGES.
+
+    Returns:
+        nx.Graph: Subgraph with at most n edges.
+    """
+    edges = sorted(
+        graph.edges(data="weight", default=1),
+        key=lambda e: (-e[2], min(e[0], e[1]), max(e[0], e[1])),
+    )[:n]
+    view = nx.Graph()
+    for u, v, weight in edges:
+        for node in (u, v):
+            if node not in view:
+                view.add_node(node, **graph.nodes[node])
+        view.add_edge(u, v, weight=weight)
+    return view
+
+
+def lab_view(graph: nx.Graph, labs_by_name: dict[str, list[str]]) -> nx.Graph:
+    """
+    Aggregates professor-professor coauthorships into a lab-level graph.
+
+    Professors without a lab are grouped under UNASSIGNED_LAB; a professor in
+    two labs counts for both. External coauthors are left out. Edge weights
+    sum the coauthorship weights between the labs' members, and each node
+    records its number of professors and its internal coauthorship weight.
+
+    Args:
+        graph (nx.Graph): Coauthorship graph.
+        labs_by_name (dict[str, list[str]]): Output of production_cube.load_labs.
+
+    Returns:
+        nx.Graph: One node per lab.
+    """
+
+    def labs_of(node: str) -> list[str]:
+        return labs_by_name.get(fold_accents(node.strip())) or [UNASSIGNED_LAB]
+
+    view = nx.Graph()
+    for node, professor in graph.nodes(data="professor", default=False):
+        if not professor:
+            continue
+        for lab in labs_of(node):
+            if lab not in view:
+                view.add_node(lab, professor=True, members=0, internal=0)
+            view.nodes[lab]["members"] += 1
+    for u, v, weight in graph.edges(data="weight", default=1):
+        if not (graph.nodes[u].get("professor") and graph.nodes[v].get("professor")):
+            continue
+        for lab_u in labs_of(u):
+            for lab_v in labs_of(v):
+                if lab_u == lab_v:
+                    view.nodes[lab_u]["internal"] += weight
+                elif view.has_edge(lab_u, lab_v):
+                    view[lab_u][lab_v]["weight"] += weight
+                else:
+                    view.add_edge(lab_u, lab_v, weight=weight)
+    return view
+
+
+class LayoutCache:
+    """
+    Stores node positions and wrapped labels, one JSON file per view graph.
+
+    Files are keyed by the fingerprint of the reduced graph and the layout
+    parameters, so a refresh that only touches nodes outside a view reuses
+    its layout. The latest layout of each view name is recorded as well and
+    seeds the next one, which keeps nodes in place across refreshes.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, fingerprint: str, params: dict) -> str:
+        suffix = "-".join(f"{key}{value}" for key, value in sorted(params.items()))
+        return os.path.join(self.cache_dir, f"{fingerprint}-{suffix}.json")
+
+    def _write(self, path: str, data: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def get(self, fingerprint: str, params: dict) -> dict | None:
+        """
+        Returns a cached layout.
+
+        Args:
+            fingerprint (str): Fingerprint of the view graph.
+            params (dict): Layout parameters.
+
+        Returns:
+            dict | None: {"positions": ..., "labels": ...}, or None.
+        """
+        try:
+            with open(self._path(fingerprint, params), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest(self, name: str) -> dict | None:
+        """
+        Returns the most recent layout of a view, whatever its graph.
+
+        Args:
+            name (str): View name.
+
+        Returns:
+            dict | None: The layout, or None if there is none.
+        """
+        try:
+            with open(
+                os.path.join(self.cache_dir, LATEST_FILENAME), encoding="utf-8"
+            ) as f:
+                entry = json.load(f)[name]
+        except (OSError, ValueError, KeyError):
+            return None
+        return self.get(entry["fingerprint"], entry["params"])
+
+    def put(self, name: str, fingerprint: str, params: dict, layout: dict) -> None:
+        """
+        Stores a layout and marks it as the latest of its view.
+
+        Args:
+            name (str): View name.
+            fingerprint (str): Fingerprint of the view graph.
+            params (dict): Layout parameters.
+            layout (dict): {"positions": ..., "labels": ...}.
+        """
+        self._write(self._path(fingerprint, params), layout)
+        latest_path = os.path.join(self.cache_dir, LATEST_FILENAME)
+        try:
+            with open(latest_path, encoding="utf-8") as f:
+                latest = json.load(f)
+        except (OSError, ValueError):
+            latest = {}
+        latest[name] = {"fingerprint": fingerprint, "params": params}
+        self._write(latest_path, latest)
+
+
+@functools.cache
+def _notebook_utils() -> types.ModuleType:
+    """
+    Loads notebook/utils_lattes.py by path, leaving sys.path untouched.
+    """
+    spec = importlib.util.spec_from_file_location("utils_lattes", NOTEBOOK_UTILS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compute_layout(
+    graph: nx.Graph,
+    previous: dict[str, list[float]] | None = None,
+    seed: int = DEFAULT_SEED,
+    iterations: int = LAYOUT_ITERATIONS,
+) -> dict[str, list[float]]:
+    """
+    Places the nodes with a weighted force-directed (spring) layout.
+
+    Args:
+        graph (nx.Graph): View graph.
+        previous (dict[str, list[float]] | None): Earlier positions; nodes
+            found there start from them. Defaults to None.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+        iterations (int): Layout iterations. Defaults to LAYOUT_ITERATIONS.
+
+    Returns:
+        dict[str, list[float]]: [x, y] of each node, within +-LAYOUT_SCALE.
+    """
+    if graph.number_of_nodes() == 0:
+        return {}
+    initial = None
+    if previous:
+        known = {
+            node: [value / LAYOUT_SCALE for value in previous[node]]
+            for node in graph
+            if node in previous
+        }
+        initial = known or None
+    positions = nx.spring_layout(
+        graph,
+        pos=initial,
+        weight="weight",
+        iterations=iterations,
+        scale=LAYOUT_SCALE,
+        seed=seed,
+    )
+    return {
+        node: [round(float(x), 2), round(float(y), 2)]
+        for node, (x, y) in positions.items()
+    }
+
+
+def export_view(
+    name: str,
+    graph: nx.Graph,
+    params: dict,
+    cache_dir: str | None = None,
+    seed: int = DEFAULT_SEED,
+) -> NetworkView:
+    """
+    Lays out a reduced graph and packs it for pyvis/Plotly.
+
+    Positions and wrapped labels come from the layout cache when the same
+    view graph was laid out before; otherwise they are computed (seeded by
+    the view's previous layout) and cached.
+
+    Args:
+        name (str): View name, e.g. "kcore".
+        graph (nx.Graph): Reduced graph.
+        params (dict): Parameters that produced the view (recorded only).
+        cache_dir (str | None): Layout cache directory. Defaults to no caching.
+        seed (int): Layout seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        NetworkView: Nodes with position, label and size; weighted edges.
+    """
+    fingerprint = graph_fingerprint(graph)
+    layout_params = {"s": seed, "i": LAYOUT_ITERATIONS, "w": LABEL_WIDTH}
+    cache = LayoutCache(cache_dir) if cache_dir else None
+
+    layout = cache.get(fingerprint, layout_params) if cache else None
+    if layout is None:
+        previous = cache.latest(name) if cache else None
+        quebra_nome = _notebook_utils().quebra_nome
+        layout = {
+            "positions": compute_layout(
+                graph, previous["positions"] if previous else None, seed
+            ),
+            "labels": {node: quebra_nome(node, LABEL_WIDTH) for node in graph},
+        }
+        if cache:
+            cache.put(name, fingerprint, layout_params, layout)
+
+    strength = dict(graph.degree(weight="weight"))
+    nodes = []
+    for node, data in sorted(graph.nodes(data=True)):
+        x, y = layout["positions"][node]
+        nodes.append(
+            {
+                "id": node,
+                "label": layout["labels"][node],
+                "x": x,
+                "y": y,
+                "size": strength[node],
+                **data,
+            }
+        )
+    edges = [
+        {"source": u, "target": v, "weight": weight}
+        for u, v, weight in sorted(graph.edges(data="weight", default=1))
+    ]
+    return NetworkView(name, fingerprint, params, nodes, edges)
+
+
+def save_view(view: NetworkView, output_dir: str) -> str:
+    """
+    Writes a view to <output_dir>/<name>.json.
+
+    Args:
+        view (NetworkView): View to write.
+        output_dir (str): Destination directory.
+
+    Returns:
+        str: Path of the written file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{view.name}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(asdict(view), f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def load_view(path: str) -> NetworkView:
+    """
+    Reads a view written by `save_view`.
+
+    Args:
+        path (str): View JSON file.
+
+    Returns:
+        NetworkView: The view.
+    """
+    with open(path, encoding="utf-8") as f:
+        return NetworkView(**json.load(f))
+
+
+def to_pyvis(view: NetworkView, height: str = "750px", notebook: bool = True):
+    """
+    Builds a pyvis network with fixed positions and physics disabled.
+
+    Args:
+        view (NetworkView): Exported view.
+        height (str): Canvas height. Defaults to "750px".
+        notebook (bool): Render inside Jupyter. Defaults to True.
+
+    Returns:
+        pyvis.network.Network: Network ready for .show() or .write_html().
+    """
+    # Imported here so that exporting views does not need the plotting stack
+    from pyvis.network import Network
+
+    net = Network(height=height, width="100%", notebook=notebook)
+    for node in view.nodes:
+        net.add_node(
+            node["id"],
+            label=node["label"],
+            title=node["id"],
+            x=node["x"],
+            y=node["y"],
+            size=10 + min(node["size"], 40),
+            color="#d62728" if node.get("professor") else "#1f77b4",
+            physics=False,
+        )
+    for edge in view.edges:
+        net.add_edge(edge["source"], edge["target"], value=edge["weight"])
+    net.toggle_physics(False)
+    return net
+
+
+def to_plotly(view: NetworkView):
+    """
+    Builds a Plotly figure with one trace for all edges and one for nodes.
+
+    Args:
+        view (NetworkView): Exported view.
+
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+    """
+    import plotly.graph_objects as go
+
+    positions = {node["id"]: (node["x"], node["y"]) for node in view.nodes}
+    edge_x: list[float | None] = []
+    edge_y: list[float | None] = []
+    for edge in view.edges:
+        (x0, y0), (x1, y1) = positions[edge["source"]], positions[edge["target"]]
+        edge_x += [x0, x1, None]
+        edge_y += [y0, y1, None]
+    edge_trace = go.Scatter(
+        x=edge_x,
+        y=edge_y,
+        mode="lines",
+        line={"width": 0.5, "color": "#999"},
+        hoverinfo="none",
+    )
+    node_trace = go.Scatter(
+        x=[node["x"] for node in view.nodes],
+        y=[node["y"] for node in view.nodes],
+        mode="markers+text",
+        text=[node["label"].replace("\n", "<br>") for node in view.nodes],
+        hovertext=[node["id"] for node in view.nodes],
+        hoverinfo="text",
+        marker={
+            "size": [6 + min(node["size"], 30) for node in view.nodes],
+            "color": [
+                "#d62728" if node.get("professor") else "#1f77b4" for node in view.nodes
+            ],
+        },
+    )
+    figure = go.Figure([edge_trace, node_trace])
+    figure.update_layout(
+        showlegend=False,
+        xaxis={"visible": False},
+        yaxis={"visible": False},
+    )
+    return figure
+
+
+def export_views(
+    records: list[dict],
+    output_dir: str,
+    cache_dir: str | None = None,
+    k: int = DEFAULT_K_CORE,
+    top_edges: int = DEFAULT_TOP_EDGES,
+    labs_csv: str | None = None,
+    seed: int = DEFAULT_SEED,
+) -> list[NetworkView]:
+    """
+    Builds the coauthorship graph and exports its reduced views.
+
+    Args:
+        records (list[dict]): Records as produced by parse_profiles.py.
+        output_dir (str): Directory that receives one JSON file per view.
+        cache_dir (str | None): Layout cache directory. Defaults to None.
+        k (int): Minimum degree of the k-core view. Defaults to DEFAULT_K_CORE.
+        top_edges (int): Edges of the top-edges view. Defaults to
+            DEFAULT_TOP_EDGES.
+        labs_csv (str | None): prof_labs.csv; the lab view is skipped
+            without it. Defaults to None.
+        seed (int): Layout seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        list[NetworkView]: Exported views.
+    """
+    graph = build_coauthorship_graph(records)
+    logging.info(
+        f"Rede completa: {graph.number_of_nodes()} nós, "
+        f"{graph.number_of_edges()} arestas."
+    )
+    reduced = [
+        ("kcore", k_core_view(graph, k), {"k": k}),
+        ("top_edges", top_edges_view(graph, top_edges), {"n": top_edges}),
+    ]
+    if labs_csv:
+        reduced.append(("labs", lab_view(graph, load_labs(labs_csv)), {}))
+
+    views = []
+    for name, view_graph, params in reduced:
+        view = export_view(name, view_graph, params, cache_dir, seed)
+        path = save_view(view, output_dir)
+        logging.info(
+            f"Visão '{name}': {len(view.nodes)} nós, {len(view.edges)} arestas "
+            f"-> {path}"
+        )
+        views.append(view)
+    return views
+
+
+def main() -> None:
+    """
+    Command-line entry point: exports reduced views of the coauthorship network.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Exporta visões reduzidas da rede de coautoria (k-core, arestas mais "
+            "fortes, laboratórios) com posições e rótulos pré-calculados."
+        )
+    )
+    parser.add_argument("--input", required=True, help="JSON de professores.")
+    parser.add_argument("--output", required=True, help="Diretório das visões.")
+    parser.add_argument("--cache", default=None, help="Cache de layouts.")
+    parser.add_argument(
+        "--k", type=int, default=DEFAULT_K_CORE, help="Grau mínimo do k-core."
+    )
+    parser.add_argument(
+        "--top-edges",
+        type=int,
+        default=DEFAULT_TOP_EDGES,
+        help="Arestas mantidas na visão das mais fortes.",
+    )
+    parser.add_argument(
+        "--labs", default=None, help="prof_labs.csv (habilita a visão por laboratório)."
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        records = json.load(f)
+    export_views(
+        records,
+        args.output,
+        cache_dir=args.cache,
+        k=args.k,
+        top_edges=args.top_edges,
+        labs_csv=args.labs,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
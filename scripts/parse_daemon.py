@@ -0,0 +1,369 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from parse_profiles import ProfessorData, extract_professor_data
+from validate_profile import quarantine_profile, validate_profile
+
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 0.5
+
+# Largest request body accepted by POST /parse.
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+
+def _record_fragment(prof: ProfessorData) -> str:
+    """
+    Serializes one record as it appears inside the output array.
+
+    Args:
+        prof (ProfessorData): Extracted data.
+
+    Returns:
+        str: The record in the layout of save_json (indent=4, nested one
+        level), without the surrounding separator.
+    """
+    # JSON strings never contain raw newlines, so indenting every line
+    # reproduces what json.dump(indent=4) writes for a list element
+    return json.dumps(asdict(prof), ensure_ascii=False, indent=4).replace(
+        "\n", "\n    "
+    )
+
+
+class ProfileStore:
+    """
+    Watches a directory of CV HTML files and keeps their extracted data current.
+
+    Each poll compares file modification times and sizes with the previous
+    scan and re-extracts only new or changed files; removed files are dropped.
+    Whenever something changes, the consolidated JSON output is rewritten.
+    """
+
+    def __init__(
+        self,
+        input_dir: str,
+        output_path: str | None = None,
+        quarantine_dir: str | None = None,
+    ) -> None:
+        self.input_dir = input_dir
+        self.output_path = output_path
+        self.quarantine_dir = quarantine_dir
+        self._signatures: dict[str, tuple[int, int]] = {}
+        self._data: dict[str, ProfessorData] = {}
+        # filename -> serialized record, so a change re-serializes one record
+        self._fragments: dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Serializes scans triggered by the watcher and by POST /refresh
+        self._refresh_lock = threading.Lock()
+        self.last_scan: float | None = None
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """
+        Lists the HTML files of the input directory with their (mtime, size).
+
+        Returns:
+            dict[str, tuple[int, int]]: Signature of each file.
+        """
+        signatures: dict[str, tuple[int, int]] = {}
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".html"):
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _extract_file(self, filename: str) -> ProfessorData | None:
+        """
+        Validates and extracts one file.
+
+        Args:
+            filename (str): File name inside the input directory.
+
+        Returns:
+            ProfessorData | None: Extracted data, or None if rejected.
+        """
+        with open(os.path.join(self.input_dir, filename), encoding="utf-8") as f:
+            content = f.read()
+        validation = validate_profile(content)
+        if not validation.ok:
+            logging.warning(f"Documento rejeitado ({validation.reason}): {filename}.")
+            if self.quarantine_dir:
+                quarantine_profile(
+                    content, filename, validation.reason, self.quarantine_dir
+                )
+            return None
+        extracted = extract_professor_data(content)
+        if extracted is None or not extracted.identificacao.nome:
+            logging.warning(f"Nenhum dado extraído de {filename}.")
+            return None
+        return extracted
+
+    def refresh(self) -> list[str]:
+        """
+        Re-extracts the files that were added or changed since the last scan.
+
+        Returns:
+            list[str]: Names of the files that were added, changed or removed.
+        """
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> list[str]:
+        signatures = self._scan()
+        changed = [
+            name
+            for name, signature in signatures.items()
+            if self._signatures.get(name) != signature
+        ]
+        removed = [name for name in self._signatures if name not in signatures]
+
+        updates: dict[str, ProfessorData | None] = {}
+        for filename in changed:
+            try:
+                updates[filename] = self._extract_file(filename)
+            except Exception as e:
+                logging.error(f"Erro ao processar {filename}: {e}")
+                updates[filename] = None
+
+        fragments = {
+            filename: _record_fragment(extracted)
+            for filename, extracted in updates.items()
+            if extracted is not None
+        }
+        with self._lock:
+            for filename, extracted in updates.items():
+                if extracted is None:
+                    self._data.pop(filename, None)
+                    self._fragments.pop(filename, None)
+                else:
+                    self._data[filename] = extracted
+                    self._fragments[filename] = fragments[filename]
+            for filename in removed:
+                self._data.pop(filename, None)
+                self._fragments.pop(filename, None)
+            self._signatures = signatures
+            self.last_scan = time.time()
+            snapshot = sorted(
+                (prof.identificacao.nome, self._fragments[filename])
+                for filename, prof in self._data.items()
+            )
+
+        # One write per polling cycle, whatever the number of changed files
+        if (changed or removed) and self.output_path:
+            self._write_output([fragment for _, fragment in snapshot])
+            logging.info(
+                f"{len(changed)} alterados, {len(removed)} removidos; "
+                f"'{self.output_path}' atualizado ({len(snapshot)} professores)."
+            )
+        return changed + removed
+
+    def _write_output(self, fragments: list[str]) -> None:
+        """
+        Joins the serialized records into the output file, atomically.
+
+        The result is byte-identical to parse_profiles.save_json.
+
+        Args:
+            fragments (list[str]): Serialized records, sorted by name.
+        """
+        content = "[\n    " + ",\n    ".join(fragments) + "\n]" if fragments else "[]"
+        tmp_path = self.output_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.output_path)
+
+    def watch(self, interval: float, stop: threading.Event) -> None:
+        """
+        Polls the input directory until `stop` is set.
+
+        Args:
+            interval (float): Seconds between scans.
+            stop (threading.Event): Event that ends the loop.
+        """
+        while not stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.error(f"Erro ao verificar '{self.input_dir}': {e}")
+            stop.wait(interval)
+
+    def all(self) -> list[dict]:
+        """
+        Returns every extracted record, sorted by name.
+
+        Returns:
+            list[dict]: Records in the same shape as parse_profiles.py output.
+        """
+        with self._lock:
+            data = [asdict(prof) for prof in self._data.values()]
+        return sorted(data, key=lambda x: x["identificacao"]["nome"])
+
+    def get(self, lattes_id: str) -> dict | None:
+        """
+        Returns the record of one professor.
+
+        Args:
+            lattes_id (str): Lattes ID.
+
+        Returns:
+            dict | None: The record, or None if unknown.
+        """
+        with self._lock:
+            for prof in self._data.values():
+                if prof.identificacao.lattes_id == lattes_id:
+                    return asdict(prof)
+        return None
+
+    def status(self) -> dict:
+        """
+        Summarizes the store for the /status endpoint.
+
+        Returns:
+            dict: Number of files and records, and time of the last scan.
+        """
+        with self._lock:
+            return {
+                "input": self.input_dir,
+                "arquivos": len(self._signatures),
+                "professores": len(self._data),
+                "ultima_verificacao": self.last_scan,
+            }
+
+
+def _make_handler(store: ProfileStore) -> type[BaseHTTPRequestHandler]:
+    """
+    Builds the request handler class bound to a store.
+
+    Args:
+        store (ProfileStore): Store served by the handler.
+
+    Returns:
+        type[BaseHTTPRequestHandler]: Handler class.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: HTTPStatus, payload: object) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/status":
+                self._send_json(HTTPStatus.OK, store.status())
+            elif self.path == "/professores":
+                self._send_json(HTTPStatus.OK, store.all())
+            elif self.path.startswith("/professores/"):
+                record = store.get(self.path.removeprefix("/professores/"))
+                if record is None:
+                    self._send_json(HTTPStatus.NOT_FOUND, {"erro": "não encontrado"})
+                else:
+                    self._send_json(HTTPStatus.OK, record)
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"erro": "rota desconhecida"})
+
+        def do_POST(self) -> None:
+            if self.path == "/refresh":
+                self._send_json(HTTPStatus.OK, {"alterados": store.refresh()})
+                return
+            if self.path != "/parse":
+                self._send_json(HTTPStatus.NOT_FOUND, {"erro": "rota desconhecida"})
+                return
+            header = self.headers.get("Content-Length")
+            if header is None:
+                self._send_json(
+                    HTTPStatus.LENGTH_REQUIRED, {"erro": "Content-Length ausente"}
+                )
+                return
+            try:
+                length = int(header)
+            except ValueError:
+                self._send_json(
+                    HTTPStatus.BAD_REQUEST, {"erro": "Content-Length inválido"}
+                )
+                return
+            if length <= 0 or length > MAX_BODY_SIZE:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"erro": "corpo inválido"})
+                return
+            content = self.rfile.read(length).decode("utf-8", errors="replace")
+            validation = validate_profile(content)
+            if not validation.ok:
+                self._send_json(
+                    HTTPStatus.UNPROCESSABLE_ENTITY, {"erro": validation.reason}
+                )
+                return
+            extracted = extract_professor_data(content)
+            if extracted is None:
+                self._send_json(
+                    HTTPStatus.UNPROCESSABLE_ENTITY, {"erro": "falha na extração"}
+                )
+                return
+            self._send_json(HTTPStatus.OK, asdict(extracted))
+
+        def log_message(self, format: str, *args: object) -> None:
+            logging.debug(format % args)
+
+    return Handler
+
+
+def main() -> None:
+    """
+    Command-line entry point: serves the parser over localhost HTTP.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Mantém o parser carregado, observa o diretório de HTMLs e atende "
+            "requisições de parsing via HTTP local."
+        )
+    )
+    parser.add_argument("--input", required=True, help="Diretório com arquivos HTML.")
+    parser.add_argument("--output", default=None, help="JSON mantido atualizado.")
+    parser.add_argument("--quarantine", default=None, help="Diretório de quarentena.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Porta.")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Intervalo entre verificações do diretório, em segundos.",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input):
+        logging.error(f"Diretório de entrada inválido: {args.input}")
+        return
+    if args.output and not args.output.lower().endswith(".json"):
+        logging.error("A saída deve ser um arquivo .json para manter a granularidade.")
+        return
+
+    store = ProfileStore(args.input, args.output, args.quarantine)
+    store.refresh()
+
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=store.watch, args=(args.interval, stop), daemon=True
+    )
+    watcher.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(store))
+    logging.info(f"Servindo em http://{args.host}:{args.port} (Ctrl+C para sair).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Encerrando...")
+    finally:
+        stop.set()
+        server.server_close()
+        watcher.join()
+
+
+if __name__ == "__main__":
+    main()
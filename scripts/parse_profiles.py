@@ -3,9 +3,16 @@ import json
 import logging
 import os
 import re
+from collections.abc import Callable
+from contextlib import ExitStack
 from dataclasses import dataclass, asdict, field
+from functools import partial
 from bs4 import BeautifulSoup, Tag
 
+from corpus_pack import CorpusPackReader, is_pack, load_codigos, sniff_search_code
+from sharding import parse_shard, shard_of, shard_path
+from validate_profile import quarantine_profile, validate_profile
+
 # Configure logging for debugging and error tracking
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -85,6 +92,7 @@ class ProducaoBibliografica:
     revista: str | None = None
     doi: str | None = None
     paginas: str | None = None
+    tipo: str | None = None
 
 
 @dataclass
@@ -699,10 +707,16 @@ def _extract_producao_bibliografica(soup: BeautifulSoup) -> list[ProducaoBibliog
     if container is None:
         return producoes
 
-    items = container.find_all("div", class_="layout-cell-11")
+    # Subsection headers (e.g. "Artigos completos publicados em periódicos")
+    # precede their items in document order and give the production type.
+    items = container.find_all("div", class_=["layout-cell-11", "cita-artigos"])
+    tipo = None
     for item in items:
         if not isinstance(item, Tag):
             continue
+        if "cita-artigos" in (item.get("class") or []):
+            tipo = _extract_text_from_tag(item) or None
+            continue
         transform_span = item.find("span", class_="transform")
         if transform_span is None:
             continue
@@ -730,6 +744,7 @@ def _extract_producao_bibliografica(soup: BeautifulSoup) -> list[ProducaoBibliog
                 revista=revista_match.group(1).strip() if revista_match else None,
                 doi=doi_match.group(1).strip() if doi_match else None,
                 paginas=paginas_match.group(1).strip() if paginas_match else None,
+                tipo=tipo,
             )
         )
     return producoes
@@ -780,40 +795,162 @@ def extract_professor_data(content_html: str) -> ProfessorData | None:
         return None
 
 
-def process_directory(input_dir: str) -> list[ProfessorData]:
+def _list_html_documents(
+    input_path: str, stack: ExitStack
+) -> list[tuple[str, str, Callable[[], str]]]:
+    """
+    Lists the CV documents of a directory of HTML files or of a corpus pack.
+
+    Args:
+        input_path (str): Directory with HTML files, or a `.pack` file.
+        stack (ExitStack): Keeps the pack reader open while documents are loaded.
+
+    Returns:
+        list[tuple[str, str, Callable[[], str]]]: (label used in log messages,
+        K-code recorded in the pack or "", function returning the HTML
+        content) triples.
+    """
+    if is_pack(input_path):
+        reader = stack.enter_context(CorpusPackReader(input_path))
+        return [
+            (entry.nome or entry.key, entry.codigo, partial(reader.read, entry))
+            for entry in reader.entries()
+        ]
+
+    def _read_file(filepath: str) -> str:
+        with open(filepath, encoding="utf-8") as file:
+            return file.read()
+
+    return [
+        (filename, "", partial(_read_file, os.path.join(input_path, filename)))
+        for filename in os.listdir(input_path)
+        if filename.endswith(".html")
+    ]
+
+
+def _shard_key(
+    label: str, codigo: str, content: str, codigos: dict[str, str] | None
+) -> str:
+    """
+    Returns the K-code that download_profile.py --shard hashed for a document.
+
+    The code comes from the pack index, else from `codigos` (by file name),
+    else from the photo URL of an untrimmed page. Documents without any are
+    assigned by their label, which may not match the download partition.
+    """
+    nome = label.removesuffix(".html")
+    codigo = codigo or (codigos or {}).get(nome) or sniff_search_code(content)
+    if codigo:
+        return codigo
+    logging.warning(
+        f"Código de busca não encontrado para {label} (informe --faculty); "
+        "shard escolhido pelo nome do arquivo."
+    )
+    return nome
+
+
+def parse_document(
+    content: str, filename: str, quarantine_dir: str | None = None
+) -> ProfessorData | None:
+    """
+    Validates and parses one CV document.
+
+    Rejected documents are logged and, if `quarantine_dir` is given, copied
+    there; documents without a professor name are logged and dropped.
+
+    Args:
+        content (str): HTML of the document.
+        filename (str): Name used in log messages and in the quarantine.
+        quarantine_dir (str | None): Where rejected documents are copied.
+
+    Returns:
+        ProfessorData | None: The extracted data, or None if the document was
+            rejected or yielded nothing.
+    """
+    validation = validate_profile(content)
+    if not validation.ok:
+        logging.warning(f"Documento rejeitado ({validation.reason}): {filename}.")
+        if quarantine_dir:
+            quarantine_profile(content, filename, validation.reason, quarantine_dir)
+        return None
+    extracted = extract_professor_data(content)
+    if extracted and extracted.identificacao.nome:
+        return extracted
+    logging.warning(f"Nenhum dado extraído de {filename}.")
+    return None
+
+
+def process_directory(
+    input_dir: str,
+    quarantine_dir: str | None = None,
+    shard: tuple[int, int] | None = None,
+    codigos: dict[str, str] | None = None,
+) -> list[ProfessorData]:
     """
     Processes all HTML files in the input directory.
 
+    Documents failing the byte-level check in validate_profile.py (error or
+    captcha pages, truncated captures) are skipped before parsing.
+
     Args:
-        input_dir (str): Path to the directory containing HTML files.
+        input_dir (str): Path to the directory containing HTML files, or to a
+            `.pack` file written by corpus_pack.py.
+        quarantine_dir (str | None): Where rejected documents are copied.
+            Defaults to None (rejected documents are only logged).
+        shard (tuple[int, int] | None): (index, count); only documents whose
+            textual search code (K-code) hashes to this shard are parsed, the
+            same partition as download_profile.py --shard. Defaults to all.
+        codigos (dict[str, str] | None): Name -> K-code (see
+            corpus_pack.load_codigos), for HTML files whose code is not in
+            the page. Defaults to None.
 
     Returns:
         list[ProfessorData]: List of extracted professor data.
     """
-    html_files = [f for f in os.listdir(input_dir) if f.endswith(".html")]
-    logging.info(
-        f"Iniciando processamento de {len(html_files)} arquivos HTML em '{input_dir}'..."
-    )
     extracted_data: list[ProfessorData] = []
+    with ExitStack() as stack:
+        html_files = _list_html_documents(input_dir, stack)
+        logging.info(
+            f"Iniciando processamento de {len(html_files)} arquivos HTML em '{input_dir}'..."
+        )
 
-    for i, filename in enumerate(html_files):
-        filepath = os.path.join(input_dir, filename)
-        logging.info(f"({i + 1}/{len(html_files)}) Processando: {filename}")
-        try:
-            with open(filepath, encoding="utf-8") as file:
-                content = file.read()
-            extracted = extract_professor_data(content)
-            if extracted and extracted.identificacao.nome:
-                extracted_data.append(extracted)
-            else:
-                logging.warning(f"Nenhum dado extraído de {filename}.")
-        except Exception as e:
-            logging.error(f"Erro ao processar {filename}: {e}")
+        for i, (filename, codigo, load) in enumerate(html_files):
+            logging.info(f"({i + 1}/{len(html_files)}) Processando: {filename}")
+            try:
+                content = load()
+                if shard is not None:
+                    key = _shard_key(filename, codigo, content, codigos)
+                    if shard_of(key, shard[1]) != shard[0]:
+                        continue
+                extracted = parse_document(content, filename, quarantine_dir)
+                if extracted is not None:
+                    extracted_data.append(extracted)
+            except Exception as e:
+                logging.error(f"Erro ao processar {filename}: {e}")
 
     logging.info("Processamento concluído!")
     return extracted_data
 
 
+def save_json(extracted_data: list[ProfessorData], output_path: str) -> None:
+    """
+    Writes extracted data to a JSON file, sorted by professor name.
+
+    The file is written to a temporary path and then renamed, so readers never
+    see a partially written output.
+
+    Args:
+        extracted_data (list[ProfessorData]): Data to save.
+        output_path (str): Destination .json path.
+    """
+    data = [asdict(prof) for prof in extracted_data]
+    data.sort(key=lambda x: x["identificacao"]["nome"])
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, output_path)
+
+
 def main() -> None:
     """
     Main entry point: Parses arguments, processes files, and saves output.
@@ -822,24 +959,61 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Processa currículos Lattes em HTML. Salva em JSON granular."
     )
-    parser.add_argument("--input", required=True, help="Diretório com arquivos HTML.")
+    parser.add_argument(
+        "--input",
+        required=True,
+        help="Diretório com arquivos HTML ou pacote .pack (corpus_pack.py).",
+    )
     parser.add_argument(
         "--output",
         required=True,
         help="Caminho de saída (deve ser .json).",
     )
+    parser.add_argument(
+        "--quarantine",
+        default=None,
+        help="Diretório para onde vão os documentos inválidos (opcional).",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help=(
+            "Processa só o shard i/N, pelo hash do código de busca (K-code): a "
+            "mesma partição do download_profile.py --shard. A saída recebe o "
+            "sufixo .shard-i-of-N. Combine com sharding.py merge."
+        ),
+    )
+    parser.add_argument(
+        "--faculty",
+        nargs="+",
+        default=None,
+        help=(
+            "CSV(s) de professores (formato de data/professores_ci.csv) com os "
+            "códigos de busca dos HTMLs reduzidos, usados com --shard."
+        ),
+    )
     args = parser.parse_args()
 
-    if not os.path.isdir(args.input):
+    if not os.path.isdir(args.input) and not is_pack(args.input):
         logging.error(f"Diretório de entrada inválido: {args.input}")
         return
 
-    extracted_data = process_directory(args.input)
+    codigos = None
+    if args.faculty:
+        codigos = {}
+        for path in args.faculty:
+            codigos.update(load_codigos(path))
+    extracted_data = process_directory(args.input, args.quarantine, args.shard, codigos)
     if not extracted_data:
         logging.warning("Nenhum dado extraído.")
-        return
+        # An empty shard still writes "[]", so that sharding.py merge finds it
+        if args.shard is None:
+            return
 
     output_path = args.output
+    if args.shard is not None:
+        output_path = shard_path(output_path, *args.shard)
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
@@ -851,10 +1025,7 @@ def main() -> None:
         return
 
     try:
-        data = [asdict(prof) for prof in extracted_data]
-        data.sort(key=lambda x: x["identificacao"]["nome"])
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        save_json(extracted_data, output_path)
         logging.info(
             f"Dados salvos em '{output_path}' ({len(extracted_data)} professores)."
         )
@@ -0,0 +1,700 @@
+import argparse
+import ast
+import csv
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from graphlib import TopologicalSorter
+
+from parse_profiles import parse_document
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Loaded by path from network_views.py, so not found by module_closure
+NOTEBOOK_UTILS = os.path.join(SCRIPTS_DIR, "..", "notebook", "utils_lattes.py")
+STATE_FILENAME = "pipeline_state.json"
+HASHES_FILENAME = "file_hashes.json"
+RECORDS_DIRNAME = "records"
+
+# Columns of data/professores.csv, as read by the notebook.
+SUMMARY_COLUMNS = [
+    "nome_professor",
+    "resumo_professor",
+    "formacoes_academicas",
+    "projetos_pesquisa",
+    "coautores_publicacoes",
+    "colaboradores_projetos",
+]
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline.
+
+    Exactly one of `command` (run as a subprocess from the scripts
+    directory) and `action` (called in-process) is set. Stages depend on the
+    stages whose outputs appear among their inputs.
+    """
+
+    name: str
+    inputs: list[str]
+    outputs: list[str]
+    command: list[str] | None = None
+    action: Callable[[], None] | None = None
+    params: dict = field(default_factory=dict)
+    code: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    elapsed: float
+    reason: str | None = None
+
+
+class FileHasher:
+    """
+    Content hashes of files and directories, memoized by (size, mtime).
+
+    Rehashing the downloaded CVs on every run would dominate a no-op
+    refresh; files whose size and modification time are unchanged reuse the
+    digest stored in HASHES_FILENAME.
+    """
+
+    def __init__(self, state_dir: str) -> None:
+        self.path = os.path.join(state_dir, HASHES_FILENAME)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._memo: dict[str, list] = json.load(f)
+        except (OSError, ValueError):
+            self._memo = {}
+
+    def _file(self, path: str) -> str:
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        memo = self._memo.get(key)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self._memo[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def digest(self, path: str) -> str | None:
+        """
+        Hashes a file, or a directory as the sorted list of its files' hashes.
+
+        Args:
+            path (str): File or directory.
+
+        Returns:
+            str | None: Hex SHA-256 digest, or None if the path does not exist.
+        """
+        if os.path.isfile(path):
+            return self._file(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.sha256(b"dir\0")
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".tmp"):
+                    continue
+                filepath = os.path.join(root, name)
+                relative = os.path.relpath(filepath, path)
+                digest.update(f"{relative}\0{self._file(filepath)}\n".encode())
+        return digest.hexdigest()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._memo, f)
+        os.replace(self.path + ".tmp", self.path)
+
+
+def _stage_fingerprint(
+    stage: Stage, hasher: FileHasher
+) -> tuple[str, dict[str, str | None]]:
+    """
+    Combines the stage's input hashes, parameters and code hashes.
+
+    Args:
+        stage (Stage): Stage to fingerprint.
+        hasher (FileHasher): Source of file hashes.
+
+    Returns:
+        tuple[str, dict[str, str | None]]: Fingerprint and the hash of each
+        input and code file (used to explain why a stage reruns).
+    """
+    parts = {path: hasher.digest(path) for path in [*stage.inputs, *stage.code]}
+    payload = json.dumps(
+        {
+            "parts": parts,
+            "params": stage.params,
+            "command": stage.command,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), parts
+
+
+def order_stages(stages: list[Stage]) -> list[Stage]:
+    """
+    Sorts stages so that every stage runs after those producing its inputs.
+
+    Args:
+        stages (list[Stage]): Stages in any order.
+
+    Returns:
+        list[Stage]: Stages in dependency order.
+
+    Raises:
+        graphlib.CycleError: If the stages depend on each other in a cycle.
+    """
+    producers = {
+        os.path.normpath(output): stage.name
+        for stage in stages
+        for output in stage.outputs
+    }
+    by_name = {stage.name: stage for stage in stages}
+    sorter = TopologicalSorter()
+    for stage in stages:
+        upstream = {
+            producers[os.path.normpath(path)]
+            for path in stage.inputs
+            if os.path.normpath(path) in producers
+        }
+        sorter.add(stage.name, *(upstream - {stage.name}))
+    return [by_name[name] for name in sorter.static_order()]
+
+
+def _upstream(stages: list[Stage], targets: list[str]) -> set[str]:
+    """
+    Returns the named stages together with every stage they depend on.
+    """
+    producers = {
+        os.path.normpath(output): stage for stage in stages for output in stage.outputs
+    }
+    by_name = {stage.name: stage for stage in stages}
+    selected: set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        for path in by_name[name].inputs:
+            producer = producers.get(os.path.normpath(path))
+            if producer is not None:
+                pending.append(producer.name)
+    return selected
+
+
+def run_pipeline(
+    stages: list[Stage],
+    state_dir: str,
+    targets: list[str] | None = None,
+    force: list[str] | None = None,
+    dry_run: bool = False,
+) -> list[StageResult]:
+    """
+    Runs the stages whose inputs, parameters or code changed since their last
+    successful run.
+
+    A stage is skipped when its fingerprint matches the recorded one and its
+    outputs still hash to the recorded values. Because a stage's inputs
+    include its upstream outputs, a rerun that produces identical outputs
+    leaves the downstream stages skipped as well.
+
+    Args:
+        stages (list[Stage]): Pipeline stages.
+        state_dir (str): Directory of the pipeline state.
+        targets (list[str] | None): Stages to bring up to date, with their
+            upstream stages. Defaults to all.
+        force (list[str] | None): Stages to run even if unchanged.
+        dry_run (bool): Only report what would run. Defaults to False.
+
+    Returns:
+        list[StageResult]: Status of each selected stage ("skipped", "ran" or
+        "would_run"), in execution order.
+
+    Raises:
+        subprocess.CalledProcessError: If a command stage fails; the state of
+            the stages completed before it is kept.
+    """
+    state_path = os.path.join(state_dir, STATE_FILENAME)
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state: dict[str, dict] = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    hasher = FileHasher(state_dir)
+    selected = _upstream(stages, targets) if targets else None
+    force = set(force or [])
+
+    def save_state() -> None:
+        os.makedirs(state_dir, exist_ok=True)
+        with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(state_path + ".tmp", state_path)
+        hasher.save()
+
+    results = []
+    try:
+        for stage in order_stages(stages):
+            if selected is not None and stage.name not in selected:
+                continue
+            fingerprint, parts = _stage_fingerprint(stage, hasher)
+            previous = state.get(stage.name)
+            reason = _rerun_reason(stage, previous, fingerprint, parts, hasher)
+            if stage.name in force:
+                reason = "forçado"
+            if reason is None:
+                logging.info(f"[{stage.name}] sem alterações, ignorado.")
+                results.append(StageResult(stage.name, "skipped", 0.0))
+                continue
+            if dry_run:
+                logging.info(f"[{stage.name}] seria executado ({reason}).")
+                results.append(StageResult(stage.name, "would_run", 0.0, reason))
+                continue
+
+            logging.info(f"[{stage.name}] executando ({reason})...")
+            started = time.monotonic()
+            try:
+                if stage.command is not None:
+                    subprocess.run(stage.command, cwd=SCRIPTS_DIR, check=True)
+                else:
+                    stage.action()
+            except Exception:
+                # A failed stage must run again next time
+                state.pop(stage.name, None)
+                raise
+            elapsed = time.monotonic() - started
+            state[stage.name] = {
+                "fingerprint": fingerprint,
+                "inputs": parts,
+                "params": stage.params,
+                "outputs": {path: hasher.digest(path) for path in stage.outputs},
+                "finished_at": datetime.now(UTC).isoformat(),
+                "elapsed": round(elapsed, 3),
+            }
+            logging.info(f"[{stage.name}] concluído em {elapsed:.1f} s.")
+            results.append(StageResult(stage.name, "ran", elapsed, reason))
+    finally:
+        if not dry_run:
+            save_state()
+    return results
+
+
+def _rerun_reason(
+    stage: Stage,
+    previous: dict | None,
+    fingerprint: str,
+    parts: dict[str, str | None],
+    hasher: FileHasher,
+) -> str | None:
+    """
+    Explains why a stage must run, or returns None if it is up to date.
+    """
+    if previous is None:
+        return "nunca executado"
+    if previous["fingerprint"] != fingerprint:
+        changed = [
+            path
+            for path, digest in parts.items()
+            if previous["inputs"].get(path) != digest
+        ]
+        if changed:
+            return "alterados: " + ", ".join(changed)
+        return "parâmetros alterados"
+    for path, digest in previous["outputs"].items():
+        if digest is None:
+            continue
+        if hasher.digest(path) != digest:
+            return f"saída ausente ou modificada: {path}"
+    return None
+
+
+def _write_json(data: object, output_path: str, indent: int | None = 4) -> None:
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(output_path + ".tmp", output_path)
+
+
+def parse_incremental(
+    input_dir: str,
+    output_path: str,
+    cache_dir: str,
+    parser_version: str,
+    quarantine_dir: str | None = None,
+) -> int:
+    """
+    Parses a directory of CVs, reusing the records of unchanged documents.
+
+    Each document's record is cached under the hash of its content and of
+    the parser code, so after one CV changes only that CV is parsed again.
+    The output is identical to parse_profiles.py's.
+
+    Args:
+        input_dir (str): Directory with HTML files.
+        output_path (str): Destination .json path.
+        cache_dir (str): Directory of the per-document record cache.
+        parser_version (str): Hash of the parser code.
+        quarantine_dir (str | None): Where rejected documents are copied.
+
+    Returns:
+        int: Number of records written.
+    """
+    records_dir = os.path.join(cache_dir, RECORDS_DIRNAME)
+    os.makedirs(records_dir, exist_ok=True)
+    records = []
+    parsed = 0
+    for filename in sorted(os.listdir(input_dir)):
+        if not filename.endswith(".html"):
+            continue
+        with open(os.path.join(input_dir, filename), encoding="utf-8") as f:
+            content = f.read()
+        key = hashlib.sha256(
+            (parser_version + "\0" + content).encode("utf-8")
+        ).hexdigest()
+        cached_path = os.path.join(records_dir, f"{key}.json")
+        if os.path.exists(cached_path):
+            with open(cached_path, encoding="utf-8") as f:
+                records.append(json.load(f))
+            continue
+
+        try:
+            extracted = parse_document(content, filename, quarantine_dir)
+        except Exception as e:
+            logging.error(f"Erro ao processar {filename}: {e}")
+            continue
+        if extracted is None:
+            continue
+        record = asdict(extracted)
+        _write_json(record, cached_path, indent=None)
+        records.append(record)
+        parsed += 1
+
+    logging.info(f"{parsed} currículos processados, {len(records) - parsed} em cache.")
+    records.sort(key=lambda x: x["identificacao"]["nome"])
+    _write_json(records, output_path)
+    return len(records)
+
+
+def export_titles(input_path: str, output_path: str) -> None:
+    """
+    Writes the production titles used by the clustering analyses.
+
+    Args:
+        input_path (str): JSON written by parse_profiles.py.
+        output_path (str): Destination, in the {"titulos": [...]} format of
+            data/titulos_producoes.json. Repeated titles are kept once.
+    """
+    with open(input_path, encoding="utf-8") as f:
+        records = json.load(f)
+    titulos = dict.fromkeys(
+        producao["titulo"]
+        for record in records
+        for producao in record.get("producao_bibliografica", [])
+        if producao.get("titulo")
+    )
+    _write_json({"titulos": list(titulos)}, output_path)
+
+
+def export_summary(input_path: str, output_path: str) -> None:
+    """
+    Writes the one-row-per-professor table, in the format of data/professores.csv.
+
+    Args:
+        input_path (str): JSON written by parse_profiles.py.
+        output_path (str): Destination .csv path.
+    """
+    with open(input_path, encoding="utf-8") as f:
+        records = json.load(f)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path + ".tmp", "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(
+                {
+                    "nome_professor": record["identificacao"]["nome"],
+                    "resumo_professor": record.get("resumo") or "",
+                    "formacoes_academicas": " | ".join(
+                        f"{f['tipo_formacao']} ({f['periodo']}): "
+                        f"{f['descricao_formacao']}"
+                        for f in record.get("formacao_academica", [])
+                    ),
+                    "projetos_pesquisa": " | ".join(
+                        f"{p['titulo']} ({p['periodo']}) - Situação: {p['situacao']}"
+                        for p in record.get("projetos_pesquisa", [])
+                    ),
+                    "coautores_publicacoes": "; ".join(
+                        sorted(set(record.get("coautores_publicacoes", [])))
+                    ),
+                    "colaboradores_projetos": "; ".join(
+                        sorted(set(record.get("colaboradores_projetos", [])))
+                    ),
+                }
+            )
+    os.replace(output_path + ".tmp", output_path)
+
+
+def _script(name: str) -> str:
+    return os.path.join(SCRIPTS_DIR, name)
+
+
+def module_closure(script: str) -> list[str]:
+    """
+    Lists a script and the local modules it imports, transitively.
+
+    Used as a stage's `code`, so that editing any helper module the stage
+    runs (e.g. search_index.py under production_cube.py) invalidates it.
+    Imports are resolved against the scripts directory; third-party modules
+    are ignored.
+
+    Args:
+        script (str): Path of the entry-point script.
+
+    Returns:
+        list[str]: Paths of the script and its local dependencies, sorted.
+    """
+    seen = set()
+    pending = [os.path.abspath(script)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                candidate = os.path.join(SCRIPTS_DIR, module.split(".")[0] + ".py")
+                if os.path.exists(candidate):
+                    pending.append(os.path.abspath(candidate))
+    return sorted(seen)
+
+
+def build_stages(args: argparse.Namespace) -> list[Stage]:
+    """
+    Describes the project's pipeline: download, parse, exported tables and
+    the cached analyses.
+
+    Every generated file goes under `args.output`, so the tracked tables in
+    data/ are never overwritten; only `prof_labs.csv` is read from `args.data`.
+
+    Args:
+        args (argparse.Namespace): Parsed command line of `main`.
+
+    Returns:
+        list[Stage]: The stages, in any order.
+    """
+    output = args.output
+    professores_json = os.path.join(output, "professores.json")
+    titles_json = os.path.join(output, "titulos_producoes.json")
+    summary_csv = os.path.join(output, "professores.csv")
+    labs_csv = os.path.join(args.data, "prof_labs.csv")
+    cache_dir = os.path.join(args.state, "cache")
+    parser_code = module_closure(_script("parse_profiles.py"))
+    hasher = FileHasher(args.state)
+    parser_version = hashlib.sha256(
+        "".join(hasher.digest(path) or "" for path in parser_code).encode()
+    ).hexdigest()
+
+    stages = []
+    if args.download:
+        stages.append(
+            Stage(
+                name="download",
+                inputs=[args.faculty],
+                outputs=[args.profiles],
+                command=[
+                    sys.executable,
+                    _script("download_profile.py"),
+                    "--input",
+                    os.path.abspath(args.faculty),
+                    "--output",
+                    os.path.abspath(args.profiles),
+                    *(["--trim"] if args.trim else []),
+                ],
+                params={"trim": args.trim},
+                code=module_closure(_script("download_profile.py")),
+            )
+        )
+    stages += [
+        Stage(
+            name="parse",
+            inputs=[args.profiles],
+            outputs=[professores_json],
+            action=lambda: parse_incremental(
+                args.profiles,
+                professores_json,
+                cache_dir,
+                parser_version,
+                args.quarantine,
+            ),
+            code=module_closure(_script("pipeline.py")),
+        ),
+        Stage(
+            name="titles",
+            inputs=[professores_json],
+            outputs=[titles_json],
+            action=lambda: export_titles(professores_json, titles_json),
+            code=[_script("pipeline.py")],
+        ),
+        Stage(
+            name="summary",
+            inputs=[professores_json],
+            outputs=[summary_csv],
+            action=lambda: export_summary(professores_json, summary_csv),
+            code=[_script("pipeline.py")],
+        ),
+        Stage(
+            name="cube",
+            inputs=[professores_json, labs_csv],
+            outputs=[os.path.join(output, "cubo")],
+            command=[
+                sys.executable,
+                _script("production_cube.py"),
+                "--input",
+                os.path.abspath(professores_json),
+                "--output",
+                os.path.abspath(os.path.join(output, "cubo")),
+                "--labs",
+                os.path.abspath(labs_csv),
+            ],
+            code=module_closure(_script("production_cube.py")),
+        ),
+        Stage(
+            name="network",
+            inputs=[professores_json, labs_csv],
+            outputs=[os.path.join(output, "visoes_rede")],
+            command=[
+                sys.executable,
+                _script("network_views.py"),
+                "--input",
+                os.path.abspath(professores_json),
+                "--output",
+                os.path.abspath(os.path.join(output, "visoes_rede")),
+                "--cache",
+                os.path.abspath(os.path.join(cache_dir, "layouts")),
+                "--labs",
+                os.path.abspath(labs_csv),
+            ],
+            code=[
+                *module_closure(_script("network_views.py")),
+                os.path.abspath(NOTEBOOK_UTILS),
+            ],
+        ),
+    ]
+    return stages
+
+
+def main() -> None:
+    """
+    Command-line entry point: brings the pipeline's artifacts up to date.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Executa o fluxo download -> parsing -> artefatos gerados -> "
+            "análises, pulando as etapas cujas entradas não mudaram."
+        )
+    )
+    parser.add_argument(
+        "--profiles",
+        default="professores_perfil_html",
+        help="Diretório dos HTMLs (default: professores_perfil_html).",
+    )
+    parser.add_argument(
+        "--data",
+        default="data",
+        help="Diretório com o prof_labs.csv (default: data).",
+    )
+    parser.add_argument(
+        "--output",
+        default="data/gerado",
+        help=(
+            "Diretório dos artefatos gerados; os arquivos versionados em data/ "
+            "não são sobrescritos (default: data/gerado)."
+        ),
+    )
+    parser.add_argument(
+        "--state",
+        default=".pipeline",
+        help="Estado e caches do pipeline (default: .pipeline).",
+    )
+    parser.add_argument(
+        "--download",
+        action="store_true",
+        help="Inclui a etapa de download (requer Playwright e acesso ao Lattes).",
+    )
+    parser.add_argument(
+        "--faculty",
+        default="data/professores_ci.csv",
+        help="CSV de professores usado no download.",
+    )
+    parser.add_argument("--trim", action="store_true", help="Download reduzido.")
+    parser.add_argument("--quarantine", default=None, help="Diretório de quarentena.")
+    parser.add_argument(
+        "--only", nargs="+", default=None, help="Etapas alvo (e suas dependências)."
+    )
+    parser.add_argument(
+        "--force", nargs="+", default=None, help="Etapas executadas mesmo sem mudanças."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Só mostra o que seria executado."
+    )
+    args = parser.parse_args()
+
+    stages = build_stages(args)
+    names = {stage.name for stage in stages}
+    unknown = set(args.only or []) | set(args.force or [])
+    unknown -= names
+    if unknown:
+        parser.error(
+            f"Etapas desconhecidas: {', '.join(sorted(unknown))} "
+            f"(disponíveis: {', '.join(sorted(names))})."
+        )
+
+    started = time.monotonic()
+    try:
+        results = run_pipeline(
+            stages, args.state, args.only, args.force, dry_run=args.dry_run
+        )
+    except (subprocess.CalledProcessError, OSError) as e:
+        logging.error(f"Pipeline interrompido: {e}")
+        sys.exit(1)
+    ran = sum(result.status == "ran" for result in results)
+    logging.info(
+        f"{ran} etapas executadas, {len(results) - ran} sem execução, "
+        f"em {time.monotonic() - started:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from search_index import fold_accents
+
+CUBE_ARRAYS_FILENAME = "cube.npz"
+CUBE_LABELS_FILENAME = "cube.json"
+
+# Year used for productions whose `ano` is missing or not a year.
+UNDATED = 0
+UNTYPED = "Não identificado"
+
+# Value of the "Laboratório" column for professors without a lab.
+NO_LAB = "0"
+
+
+@dataclass
+class ProductionCube:
+    """
+    Professor x year x production-type count cube, rolled up to labs.
+
+    Attributes:
+        professors (list[str]): Professor keys (Lattes ID, or name).
+        names (list[str]): Professor names, aligned with `professors`.
+        fingerprints (list[str]): Hash of each professor's productions, used to
+            refresh only the professors whose records changed.
+        years (np.ndarray): Sorted year axis (int16).
+        types (list[str]): Production types (subsection headers of the CV).
+        counts (np.ndarray): Counts of shape (professors, years, types).
+        undated (np.ndarray): Counts without a year, shape (professors, types).
+        labs (list[str]): Lab names from prof_labs.csv.
+        lab_members (np.ndarray): Boolean membership, shape (labs, professors).
+    """
+
+    professors: list[str]
+    names: list[str]
+    fingerprints: list[str]
+    years: np.ndarray
+    types: list[str]
+    counts: np.ndarray
+    undated: np.ndarray
+    labs: list[str]
+    lab_members: np.ndarray
+
+    @property
+    def lab_counts(self) -> np.ndarray:
+        """
+        Lab x year x type counts (a professor in several labs counts in each).
+
+        Returns:
+            np.ndarray: Array of shape (labs, years, types).
+        """
+        flat = self.counts.reshape(len(self.professors), -1)
+        rolled = self.lab_members.astype(np.int64) @ flat
+        return rolled.reshape(len(self.labs), len(self.years), len(self.types))
+
+    def professor_series(self, key: str, tipo: str | None = None) -> pd.Series:
+        """
+        Per-year production counts of one professor.
+
+        Args:
+            key (str): Professor key (Lattes ID, or name).
+            tipo (str | None): Restrict to one production type.
+
+        Returns:
+            pd.Series: Counts indexed by year.
+        """
+        row = self.counts[self.professors.index(key)]
+        values = row.sum(axis=1) if tipo is None else row[:, self.types.index(tipo)]
+        return pd.Series(values, index=self.years, name=key)
+
+    def lab_series(self, lab: str, tipo: str | None = None) -> pd.Series:
+        """
+        Per-year production counts of one lab.
+
+        Args:
+            lab (str): Lab name as written in prof_labs.csv.
+            tipo (str | None): Restrict to one production type.
+
+        Returns:
+            pd.Series: Counts indexed by year.
+        """
+        row = self.lab_counts[self.labs.index(lab)]
+        values = row.sum(axis=1) if tipo is None else row[:, self.types.index(tipo)]
+        return pd.Series(values, index=self.years, name=lab)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Long-format view of the non-zero cells, ready for plotting.
+
+        Returns:
+            pd.DataFrame: Columns lattes_id, nome, ano, tipo, quantidade.
+        """
+        p, y, t = np.nonzero(self.counts)
+        return pd.DataFrame(
+            {
+                "lattes_id": np.asarray(self.professors, dtype=object)[p],
+                "nome": np.asarray(self.names, dtype=object)[p],
+                "ano": self.years[y],
+                "tipo": np.asarray(self.types, dtype=object)[t],
+                "quantidade": self.counts[p, y, t],
+            }
+        )
+
+
+def _record_key(record: dict) -> str:
+    identificacao = record["identificacao"]
+    return identificacao.get("lattes_id") or identificacao["nome"]
+
+
+def _fingerprint(record: dict) -> str:
+    """
+    Hashes the fields of a record that feed the cube.
+
+    Args:
+        record (dict): A professor record.
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps(
+        [
+            (p.get("ano"), p.get("tipo"))
+            for p in record.get("producao_bibliografica", [])
+        ]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _parse_years(values: list[str | None]) -> np.ndarray:
+    """
+    Converts `ano` strings to an integer array (UNDATED when not a year).
+
+    Args:
+        values (list[str | None]): Raw `ano` values.
+
+    Returns:
+        np.ndarray: int16 years.
+    """
+    return np.array(
+        [int(v) if v and v.isdigit() else UNDATED for v in values], dtype=np.int16
+    )
+
+
+def _flatten(records: list[dict]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Turns the productions of the records into parallel integer arrays.
+
+    Args:
+        records (list[dict]): Professor records.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, list[str]]: (row index of the professor,
+        year, type label) for each production.
+    """
+    rows: list[int] = []
+    anos: list[str | None] = []
+    tipos: list[str] = []
+    for i, record in enumerate(records):
+        for producao in record.get("producao_bibliografica", []):
+            rows.append(i)
+            anos.append(producao.get("ano"))
+            tipos.append(producao.get("tipo") or UNTYPED)
+    return np.array(rows, dtype=np.int64), _parse_years(anos), tipos
+
+
+def _count(
+    records: list[dict], years: np.ndarray, types: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Counts productions per (professor, year, type) with a single bincount.
+
+    Args:
+        records (list[dict]): Professor records.
+        years (np.ndarray): Year axis; must contain every dated year.
+        types (list[str]): Type axis; must contain every type.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Dated counts (P, Y, T) and undated
+        counts (P, T).
+    """
+    rows, anos, tipos = _flatten(records)
+    n_p, n_y, n_t = len(records), len(years), len(types)
+    type_index = {t: i for i, t in enumerate(types)}
+    t_idx = np.array([type_index[t] for t in tipos], dtype=np.int64)
+
+    dated = anos != UNDATED
+    y_idx = np.searchsorted(years, anos[dated])
+    flat = (rows[dated] * n_y + y_idx) * n_t + t_idx[dated]
+    counts = np.bincount(flat, minlength=n_p * n_y * n_t).reshape(n_p, n_y, n_t)
+
+    flat_undated = rows[~dated] * n_t + t_idx[~dated]
+    undated = np.bincount(flat_undated, minlength=n_p * n_t).reshape(n_p, n_t)
+    return counts.astype(np.int32), undated.astype(np.int32)
+
+
+def _axes(records: list[dict]) -> tuple[np.ndarray, list[str]]:
+    """
+    Computes the year and type axes covering the records.
+
+    Args:
+        records (list[dict]): Professor records.
+
+    Returns:
+        tuple[np.ndarray, list[str]]: Contiguous year range and sorted types.
+    """
+    _, anos, tipos = _flatten(records)
+    dated = anos[anos != UNDATED]
+    if dated.size:
+        years = np.arange(dated.min(), dated.max() + 1, dtype=np.int16)
+    else:
+        years = np.array([], dtype=np.int16)
+    return years, sorted(set(tipos))
+
+
+def load_labs(labs_csv: str) -> dict[str, list[str]]:
+    """
+    Reads prof_labs.csv into a mapping of folded professor name -> labs.
+
+    Args:
+        labs_csv (str): Path to a CSV with "Nome dos Professores" and
+            "Laboratório" columns.
+
+    Returns:
+        dict[str, list[str]]: Labs of each professor.
+    """
+    labs: dict[str, list[str]] = {}
+    with open(labs_csv, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            nome = fold_accents(row["Nome dos Professores"].strip())
+            # "0" marks professors without a lab; "ARIA/LAVID" means both labs
+            for lab in (row.get("Laboratório") or "").split("/"):
+                lab = lab.strip()
+                if lab and lab != NO_LAB:
+                    labs.setdefault(nome, []).append(lab)
+    return labs
+
+
+def _membership(
+    names: list[str], labs_by_name: dict[str, list[str]]
+) -> tuple[list[str], np.ndarray]:
+    """
+    Builds the lab x professor membership matrix.
+
+    Args:
+        names (list[str]): Professor names (cube order).
+        labs_by_name (dict[str, list[str]]): Output of `load_labs`.
+
+    Returns:
+        tuple[list[str], np.ndarray]: Lab names and boolean matrix.
+    """
+    labs = sorted({lab for values in labs_by_name.values() for lab in values})
+    lab_index = {lab: i for i, lab in enumerate(labs)}
+    members = np.zeros((len(labs), len(names)), dtype=bool)
+    for j, nome in enumerate(names):
+        for lab in labs_by_name.get(fold_accents(nome.strip()), []):
+            members[lab_index[lab], j] = True
+    return labs, members
+
+
+def build_cube(
+    records: list[dict], labs_by_name: dict[str, list[str]] | None = None
+) -> ProductionCube:
+    """
+    Builds the count cube from parsed professor records.
+
+    Args:
+        records (list[dict]): Records as produced by parse_profiles.py.
+        labs_by_name (dict[str, list[str]] | None): Output of `load_labs`.
+
+    Returns:
+        ProductionCube: The cube.
+    """
+    years, types = _axes(records)
+    counts, undated = _count(records, years, types)
+    names = [r["identificacao"]["nome"] for r in records]
+    labs, members = _membership(names, labs_by_name or {})
+    return ProductionCube(
+        professors=[_record_key(r) for r in records],
+        names=names,
+        fingerprints=[_fingerprint(r) for r in records],
+        years=years,
+        types=types,
+        counts=counts,
+        undated=undated,
+        labs=labs,
+        lab_members=members,
+    )
+
+
+def refresh_cube(
+    cube: ProductionCube,
+    records: list[dict],
+    labs_by_name: dict[str, list[str]] | None = None,
+) -> ProductionCube:
+    """
+    Updates a cube with a new set of records, recounting only changed professors.
+
+    Professors absent from `records` are dropped; the year and type axes are
+    widened when needed and existing rows are re-indexed into them.
+
+    Args:
+        cube (ProductionCube): Previously built cube.
+        records (list[dict]): Current records.
+        labs_by_name (dict[str, list[str]] | None): Output of `load_labs`.
+
+    Returns:
+        ProductionCube: The refreshed cube.
+    """
+    previous = {key: i for i, key in enumerate(cube.professors)}
+    fingerprints = [_fingerprint(r) for r in records]
+    keys = [_record_key(r) for r in records]
+    changed = [
+        i
+        for i, (key, fp) in enumerate(zip(keys, fingerprints))
+        if key not in previous or cube.fingerprints[previous[key]] != fp
+    ]
+    changed_records = [records[i] for i in changed]
+
+    new_years, new_types = _axes(changed_records)
+    years = np.union1d(cube.years, new_years).astype(np.int16)
+    if years.size:
+        years = np.arange(years.min(), years.max() + 1, dtype=np.int16)
+    types = sorted(set(cube.types) | set(new_types))
+
+    counts = np.zeros((len(records), len(years), len(types)), dtype=np.int32)
+    undated = np.zeros((len(records), len(types)), dtype=np.int32)
+    y_map = np.searchsorted(years, cube.years)
+    t_map = np.array([types.index(t) for t in cube.types], dtype=np.int64)
+    changed_set = set(changed)
+    unchanged = [i for i in range(len(records)) if i not in changed_set]
+    old_rows = np.array([previous[keys[i]] for i in unchanged], dtype=np.int64)
+    if unchanged and cube.years.size and t_map.size:
+        counts[np.ix_(unchanged, y_map, t_map)] = cube.counts[old_rows]
+    if unchanged and t_map.size:
+        undated[np.ix_(unchanged, t_map)] = cube.undated[old_rows]
+
+    if changed:
+        changed_counts, changed_undated = _count(changed_records, years, types)
+        counts[changed] = changed_counts
+        undated[changed] = changed_undated
+
+    names = [r["identificacao"]["nome"] for r in records]
+    labs, members = _membership(names, labs_by_name or {})
+    logging.info(
+        f"Cubo atualizado: {len(changed)} de {len(records)} professores recontados."
+    )
+    return ProductionCube(
+        professors=keys,
+        names=names,
+        fingerprints=fingerprints,
+        years=years,
+        types=types,
+        counts=counts,
+        undated=undated,
+        labs=labs,
+        lab_members=members,
+    )
+
+
+def save_cube(cube: ProductionCube, output_dir: str) -> None:
+    """
+    Persists the cube as NumPy arrays plus a JSON table of axis labels.
+
+    Args:
+        cube (ProductionCube): Cube to save.
+        output_dir (str): Destination directory.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    np.savez_compressed(
+        os.path.join(output_dir, CUBE_ARRAYS_FILENAME),
+        years=cube.years,
+        counts=cube.counts,
+        undated=cube.undated,
+        lab_members=cube.lab_members,
+    )
+    labels = {
+        "professors": cube.professors,
+        "names": cube.names,
+        "fingerprints": cube.fingerprints,
+        "types": cube.types,
+        "labs": cube.labs,
+    }
+    with open(
+        os.path.join(output_dir, CUBE_LABELS_FILENAME), "w", encoding="utf-8"
+    ) as f:
+        json.dump(labels, f, ensure_ascii=False)
+
+
+def load_cube(output_dir: str) -> ProductionCube:
+    """
+    Loads a cube written by `save_cube`.
+
+    Args:
+        output_dir (str): Directory containing the cube files.
+
+    Returns:
+        ProductionCube: The cube.
+    """
+    with open(os.path.join(output_dir, CUBE_LABELS_FILENAME), encoding="utf-8") as f:
+        labels = json.load(f)
+    with np.load(os.path.join(output_dir, CUBE_ARRAYS_FILENAME)) as arrays:
+        return ProductionCube(
+            professors=labels["professors"],
+            names=labels["names"],
+            fingerprints=labels["fingerprints"],
+            years=arrays["years"],
+            types=labels["types"],
+            counts=arrays["counts"],
+            undated=arrays["undated"],
+            labs=labels["labs"],
+            lab_members=arrays["lab_members"],
+        )
+
+
+def main() -> None:
+    """
+    Command-line entry point: builds or incrementally refreshes the cube.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Cubo de produção professor x ano x tipo, agregado por laboratório."
+    )
+    parser.add_argument("--input", required=True, help="JSON de professores.")
+    parser.add_argument("--output", required=True, help="Diretório do cubo.")
+    parser.add_argument(
+        "--labs", default=None, help="CSV professor -> laboratório (prof_labs.csv)."
+    )
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        records = json.load(f)
+    labs_by_name = load_labs(args.labs) if args.labs else None
+
+    if os.path.exists(os.path.join(args.output, CUBE_ARRAYS_FILENAME)):
+        cube = refresh_cube(load_cube(args.output), records, labs_by_name)
+    else:
+        cube = build_cube(records, labs_by_name)
+    save_cube(cube, args.output)
+    logging.info(
+        f"Cubo salvo em '{args.output}' ({len(cube.professors)} professores, "
+        f"{len(cube.years)} anos, {len(cube.types)} tipos, {len(cube.labs)} laboratórios)."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import re
+import threading
+import types
+import typing
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import pandas as pd
+
+from parse_profiles import ProfessorData
+from search_index import fold_accents
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+DEFAULT_CACHE_SIZE = 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass
+class RecordEntry:
+    nome: str
+    lattes_id: str | None
+    # Top-level field -> (byte offset, byte length) of its JSON value
+    spans: dict[str, tuple[int, int]]
+
+    @property
+    def key(self) -> str:
+        return self.lattes_id or self.nome
+
+
+def _skip(text: str, pos: int) -> int:
+    return _whitespace.match(text, pos).end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    if text[pos : pos + 1] != char:
+        raise ValueError(f"Esperado {char!r} na posição {pos}.")
+    return pos + 1
+
+
+def scan_records(text: str) -> list[RecordEntry]:
+    """
+    Locates every record of a parse_profiles.py JSON array, field by field.
+
+    Each top-level field value is decoded once, only to find where it ends;
+    the offsets are converted from characters to UTF-8 bytes as the scan
+    advances, so the whole file is encoded at most once.
+
+    Args:
+        text (str): Contents of the JSON file.
+
+    Returns:
+        list[RecordEntry]: Records in file order.
+
+    Raises:
+        ValueError: If the text is not a JSON array of objects.
+    """
+    char_pos, byte_pos = 0, 0
+
+    def to_bytes(pos: int) -> int:
+        nonlocal char_pos, byte_pos
+        byte_pos += len(text[char_pos:pos].encode("utf-8"))
+        char_pos = pos
+        return byte_pos
+
+    entries = []
+    pos = _expect(text, _skip(text, 0), "[")
+    pos = _skip(text, pos)
+    if text[pos : pos + 1] == "]":
+        return entries
+    while True:
+        pos = _expect(text, pos, "{")
+        spans: dict[str, tuple[int, int]] = {}
+        identificacao: dict = {}
+        pos = _skip(text, pos)
+        if text[pos : pos + 1] == "}":
+            pos += 1
+        else:
+            while True:
+                field, pos = _decoder.raw_decode(text, pos)
+                pos = _skip(text, _expect(text, _skip(text, pos), ":"))
+                value, end = _decoder.raw_decode(text, pos)
+                start = to_bytes(pos)
+                spans[field] = (start, to_bytes(end) - start)
+                if field == "identificacao":
+                    identificacao = value
+                pos = _skip(text, end)
+                if text[pos : pos + 1] == "}":
+                    pos += 1
+                    break
+                pos = _skip(text, _expect(text, pos, ","))
+        entries.append(
+            RecordEntry(
+                nome=identificacao.get("nome") or "",
+                lattes_id=identificacao.get("lattes_id"),
+                spans=spans,
+            )
+        )
+        pos = _skip(text, pos)
+        if text[pos : pos + 1] == "]":
+            return entries
+        pos = _skip(text, _expect(text, pos, ","))
+
+
+def _source_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def build_index(path: str, index_path: str | None = None) -> list[RecordEntry]:
+    """
+    Scans a JSON output and writes its record index next to it.
+
+    Args:
+        path (str): JSON written by parse_profiles.py.
+        index_path (str | None): Index destination. Defaults to path + ".idx".
+
+    Returns:
+        list[RecordEntry]: The indexed records.
+    """
+    index_path = index_path or path + INDEX_SUFFIX
+    signature = _source_signature(path)
+    # newline="" keeps \r\n as two characters, so character offsets map to
+    # the bytes on disk.
+    with open(path, encoding="utf-8", newline="") as f:
+        entries = scan_records(f.read())
+    payload = {
+        "version": INDEX_VERSION,
+        "source": signature,
+        "records": [dataclasses.asdict(entry) for entry in entries],
+    }
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(index_path + ".tmp", index_path)
+    return entries
+
+
+def load_index(path: str, index_path: str | None = None) -> list[RecordEntry]:
+    """
+    Reads the record index of a JSON output, rebuilding it if it is stale.
+
+    Args:
+        path (str): JSON written by parse_profiles.py.
+        index_path (str | None): Index path. Defaults to path + ".idx".
+
+    Returns:
+        list[RecordEntry]: The indexed records.
+    """
+    index_path = index_path or path + INDEX_SUFFIX
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") == INDEX_VERSION and payload.get(
+            "source"
+        ) == _source_signature(path):
+            return [
+                RecordEntry(
+                    nome=record["nome"],
+                    lattes_id=record["lattes_id"],
+                    spans={
+                        field: tuple(span) for field, span in record["spans"].items()
+                    },
+                )
+                for record in payload["records"]
+            ]
+    except (OSError, ValueError, KeyError):
+        pass
+    logging.info(f"Indexando '{path}'...")
+    return build_index(path, index_path)
+
+
+def _from_json(tp: object, value: object) -> object:
+    """
+    Rebuilds a value of the parse_profiles.py dataclasses from decoded JSON.
+    """
+    if value is None:
+        return None
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        return tp(
+            **{
+                f.name: _from_json(hints[f.name], value[f.name])
+                for f in dataclasses.fields(tp)
+                if f.name in value
+            }
+        )
+    origin = typing.get_origin(tp)
+    if origin is list:
+        (item_type,) = typing.get_args(tp)
+        return [_from_json(item_type, item) for item in value]
+    if origin in (typing.Union, types.UnionType):
+        # Optional fields: X | None
+        (inner,) = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        return _from_json(inner, value)
+    return value
+
+
+_FIELD_TYPES = typing.get_type_hints(ProfessorData)
+
+
+class RecordStore:
+    """
+    Lazy, read-only access to the JSON written by parse_profiles.py.
+
+    A sidecar index (see `build_index`) records the byte range of every
+    top-level field of every record, plus each professor's name and Lattes
+    ID. Filters on name and Lattes ID are answered from the index alone, and
+    reading a column decodes only that field's bytes. Decoded fields are kept
+    in an LRU cache of `cache_size` entries.
+
+    Values are shared with the cache; copy them before mutating.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index_path: str | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.path = path
+        self._entries = load_index(path, index_path)
+        self._by_key = {entry.key: i for i, entry in enumerate(self._entries)}
+        self._file = open(path, "rb")
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[int, str], object] = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "RecordStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the underlying JSON file.
+        """
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def keys(self) -> list[str]:
+        """
+        Returns the record keys (Lattes ID, or name when missing) in file order.
+        """
+        return [entry.key for entry in self._entries]
+
+    def find(
+        self,
+        nome: str | None = None,
+        lattes_ids: Iterable[str] | None = None,
+    ) -> list[str]:
+        """
+        Selects records using only the index.
+
+        Args:
+            nome (str | None): Case- and accent-insensitive substring of the
+                professor's name. Defaults to no filter.
+            lattes_ids (Iterable[str] | None): Accepted Lattes IDs. Defaults
+                to no filter.
+
+        Returns:
+            list[str]: Keys of the matching records, in file order.
+        """
+        folded = fold_accents(nome) if nome else None
+        wanted = set(lattes_ids) if lattes_ids is not None else None
+        return [
+            entry.key
+            for entry in self._entries
+            if (folded is None or folded in fold_accents(entry.nome))
+            and (wanted is None or entry.lattes_id in wanted)
+        ]
+
+    def _field(self, index: int, field: str) -> object:
+        """
+        Decodes one top-level field of a record, through the LRU cache.
+        """
+        cache_key = (index, field)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return self._cache[cache_key]
+            self.misses += 1
+            span = self._entries[index].spans.get(field)
+            if span is None:
+                return None
+            offset, length = span
+            self._file.seek(offset)
+            raw = self._file.read(length)
+        value = json.loads(raw)
+        with self._lock:
+            self._cache[cache_key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def get(self, key: str, columns: list[str] | None = None) -> dict:
+        """
+        Returns a record, or only some of its columns.
+
+        Args:
+            key (str): Lattes ID (or name, for records without one).
+            columns (list[str] | None): Top-level fields or dotted paths such
+                as "identificacao.nome". Defaults to the whole record.
+
+        Returns:
+            dict: Full record, or {column: value} for the requested columns.
+
+        Raises:
+            KeyError: If the key is not in the store.
+        """
+        index = self._by_key[key]
+        if columns is None:
+            return {
+                field: self._field(index, field) for field in self._entries[index].spans
+            }
+        row = {}
+        for column in columns:
+            field, *path = column.split(".")
+            value = self._field(index, field)
+            for part in path:
+                value = value.get(part) if isinstance(value, dict) else None
+            row[column] = value
+        return row
+
+    def get_typed(self, key: str) -> ProfessorData:
+        """
+        Returns a record as the ProfessorData dataclass of parse_profiles.py.
+
+        Args:
+            key (str): Lattes ID (or name, for records without one).
+
+        Returns:
+            ProfessorData: The record.
+        """
+        return _from_json(ProfessorData, self.get(key))
+
+    def get_field(self, key: str, field: str, typed: bool = False) -> object:
+        """
+        Returns one top-level field of a record.
+
+        Args:
+            key (str): Lattes ID (or name, for records without one).
+            field (str): ProfessorData field, e.g. "producao_bibliografica".
+            typed (bool): Rebuild the parse_profiles.py dataclasses (e.g.
+                list[ProducaoBibliografica]). Defaults to False.
+
+        Returns:
+            object: The decoded value.
+        """
+        value = self._field(self._by_key[key], field)
+        return _from_json(_FIELD_TYPES[field], value) if typed else value
+
+    def select(
+        self,
+        columns: list[str],
+        nome: str | None = None,
+        lattes_ids: Iterable[str] | None = None,
+    ) -> Iterator[dict]:
+        """
+        Iterates over the projected rows of the records passing the filters.
+
+        Args:
+            columns (list[str]): Columns, as in `get`.
+            nome (str | None): Name filter, as in `find`.
+            lattes_ids (Iterable[str] | None): Lattes ID filter, as in `find`.
+
+        Yields:
+            dict: {column: value} for each matching record.
+        """
+        for key in self.find(nome, lattes_ids):
+            yield self.get(key, columns)
+
+    def to_frame(
+        self,
+        columns: list[str],
+        nome: str | None = None,
+        lattes_ids: Iterable[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Loads the projected rows into a pandas DataFrame.
+
+        Args:
+            columns (list[str]): Columns, as in `get`.
+            nome (str | None): Name filter, as in `find`.
+            lattes_ids (Iterable[str] | None): Lattes ID filter, as in `find`.
+
+        Returns:
+            pd.DataFrame: One row per record, one column per projection.
+        """
+        return pd.DataFrame(
+            list(self.select(columns, nome, lattes_ids)), columns=columns
+        )
+
+
+def main() -> None:
+    """
+    Command-line entry point: indexes a JSON output or queries it lazily.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Leitura preguiçosa do JSON de professores: índice por registro e "
+            "campo, projeção de colunas e filtro por nome ou ID Lattes."
+        )
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="(Re)constrói o índice.")
+    index_parser.add_argument("--input", required=True, help="JSON de professores.")
+
+    query_parser = subparsers.add_parser(
+        "query", help="Imprime colunas dos registros filtrados (JSON lines)."
+    )
+    query_parser.add_argument("--input", required=True, help="JSON de professores.")
+    query_parser.add_argument(
+        "--columns",
+        nargs="+",
+        default=["identificacao.nome"],
+        help="Campos ou caminhos (ex.: identificacao.nome producao_bibliografica).",
+    )
+    query_parser.add_argument("--nome", default=None, help="Trecho do nome.")
+    query_parser.add_argument(
+        "--lattes-id", nargs="+", default=None, help="IDs Lattes aceitos."
+    )
+    args = parser.parse_args()
+
+    if args.command == "index":
+        entries = build_index(args.input)
+        logging.info(
+            f"Índice salvo em '{args.input}{INDEX_SUFFIX}' ({len(entries)} registros)."
+        )
+        return
+
+    with RecordStore(args.input) as store:
+        for row in store.select(args.columns, args.nome, args.lattes_id):
+            print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,631 @@
+import argparse
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+INDEX_VERSION = 1
+META_FILENAME = "meta.json"
+POSTINGS_FILENAME = "postings.bin"
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Fraction of tombstoned documents that triggers a compaction on update
+COMPACTION_THRESHOLD = 0.25
+
+KIND_PROFESSOR = "professor"
+KIND_PRODUCAO = "producao"
+
+STOPWORDS_PT = frozenset(
+    """
+    a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela
+    delas dele deles depois do dos e ela elas ele eles em entre era eram essa
+    essas esse esses esta estao estas este estes eu foi foram ha isso isto ja
+    lhe lhes mais mas me mesmo meu minha muito na nas nao nem no nos nossa nosso
+    num numa o os ou para pela pelas pelo pelos por qual quando que quem se sem
+    ser seu seus so sua suas tambem te tem ter um uma umas uns voce sao sobre
+    atraves partir desde ainda apos cada onde seja sido sendo assim
+    """.split()
+)
+
+STOPWORDS_EN = frozenset(
+    """
+    a about above after again all also an and any are as at be been before being
+    below between both but by can could did do does doing down during each few
+    for from further had has have having he her here hers him his how i if in
+    into is it its itself just more most no nor not of off on once only or other
+    our out over own same she should so some such than that the their them then
+    there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your using
+    based towards via
+    """.split()
+)
+
+STOPWORDS = STOPWORDS_PT | STOPWORDS_EN
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class IndexedDocument:
+    kind: str
+    lattes_id: str
+    nome: str
+    ordinal: int
+    texto: str
+    length: int
+
+
+@dataclass
+class SearchHit:
+    score: float
+    kind: str
+    lattes_id: str
+    nome: str
+    ordinal: int
+    texto: str
+
+
+@dataclass
+class _IndexMeta:
+    version: int
+    documents: list[IndexedDocument]
+    dead: set[int]
+    # term -> [offset, nbytes, df]
+    lexicon: dict[str, list[int]]
+    postings_size: int = 0
+    by_professor: dict[str, list[int]] = field(default_factory=dict)
+    # kind -> [sum of token counts, number of live documents], for BM25
+    length_stats: dict[str, list[int]] = field(default_factory=dict)
+
+
+def fold_accents(text: str) -> str:
+    """
+    Lowercases the text and strips diacritics (e.g. "Informação" -> "informacao").
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Folded text.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into accent-folded tokens, dropping Portuguese/English stopwords.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        list[str]: Tokens in document order.
+    """
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(fold_accents(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _record_key(record: dict) -> str:
+    """
+    Returns the key identifying a parsed professor record (Lattes ID, or name).
+
+    Args:
+        record (dict): A professor record as produced by parse_profiles.py.
+
+    Returns:
+        str: The record key.
+    """
+    identificacao = record.get("identificacao", {})
+    return identificacao.get("lattes_id") or identificacao.get("nome", "")
+
+
+def _documents_from_record(record: dict) -> list[tuple[str, int, str]]:
+    """
+    Builds the indexable documents of a professor record.
+
+    The professor document concatenates the summary with research project and
+    production titles; each production title is also indexed on its own.
+
+    Args:
+        record (dict): A professor record as produced by parse_profiles.py.
+
+    Returns:
+        list[tuple[str, int, str]]: (kind, ordinal, text) triples.
+    """
+    producoes = record.get("producao_bibliografica", [])
+    projetos = record.get("projetos_pesquisa", [])
+    professor_text = " ".join(
+        [record.get("resumo", "")]
+        + [p.get("titulo", "") for p in projetos]
+        + [p.get("titulo", "") for p in producoes]
+    )
+    documents = [(KIND_PROFESSOR, 0, professor_text)]
+    for i, producao in enumerate(producoes):
+        documents.append((KIND_PRODUCAO, i, producao.get("titulo", "")))
+    return documents
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """
+    Appends an unsigned LEB128 varint to the buffer.
+
+    Args:
+        value (int): Non-negative integer.
+        out (bytearray): Destination buffer.
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode_postings(postings: list[tuple[int, int]]) -> bytes:
+    """
+    Encodes a doc-id-sorted postings list as varint (doc gap, tf) pairs.
+
+    Args:
+        postings (list[tuple[int, int]]): (doc_id, term frequency) pairs.
+
+    Returns:
+        bytes: Encoded block.
+    """
+    out = bytearray()
+    previous = 0
+    for doc_id, tf in postings:
+        _encode_varint(doc_id - previous, out)
+        _encode_varint(tf, out)
+        previous = doc_id
+    return bytes(out)
+
+
+def _decode_postings(block: bytes) -> list[tuple[int, int]]:
+    """
+    Decodes a block written by `_encode_postings`.
+
+    Args:
+        block (bytes): Encoded block.
+
+    Returns:
+        list[tuple[int, int]]: (doc_id, term frequency) pairs.
+    """
+    values: list[int] = []
+    current = 0
+    shift = 0
+    for byte in block:
+        current |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(current)
+            current = 0
+            shift = 0
+    postings: list[tuple[int, int]] = []
+    doc_id = 0
+    for i in range(0, len(values), 2):
+        doc_id += values[i]
+        postings.append((doc_id, values[i + 1]))
+    return postings
+
+
+class SearchIndex:
+    """
+    On-disk inverted index with BM25 ranking over professors and productions.
+
+    The index directory holds `meta.json` (documents, lexicon and tombstones)
+    and `postings.bin` (varint-encoded postings blocks). Queries read only the
+    postings of the query terms through a memory map. Updating a professor
+    tombstones their previous documents and appends fresh postings blocks for
+    the affected terms; as in segment-based engines, document frequencies keep
+    counting tombstoned documents until the next compaction.
+    """
+
+    def __init__(self, index_dir: str, meta: _IndexMeta) -> None:
+        self.index_dir = index_dir
+        self._meta = meta
+
+    @property
+    def _postings_path(self) -> str:
+        return os.path.join(self.index_dir, POSTINGS_FILENAME)
+
+    @classmethod
+    def build(cls, records: list[dict], index_dir: str) -> "SearchIndex":
+        """
+        Builds a fresh index from parsed professor records.
+
+        Args:
+            records (list[dict]): Records as produced by parse_profiles.py.
+            index_dir (str): Directory where the index is written.
+
+        Returns:
+            SearchIndex: The newly built index.
+        """
+        os.makedirs(index_dir, exist_ok=True)
+        meta = _IndexMeta(version=INDEX_VERSION, documents=[], dead=set(), lexicon={})
+        index = cls(index_dir, meta)
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for record in records:
+            index._add_documents(record, postings)
+        index._write_postings(postings)
+        index._save_meta()
+        logging.info(
+            f"Índice construído em '{index_dir}' ({len(meta.documents)} documentos, "
+            f"{len(meta.lexicon)} termos)."
+        )
+        return index
+
+    @classmethod
+    def open(cls, index_dir: str) -> "SearchIndex":
+        """
+        Opens an existing index directory.
+
+        Args:
+            index_dir (str): Directory written by `SearchIndex.build`.
+
+        Returns:
+            SearchIndex: The loaded index.
+        """
+        with open(os.path.join(index_dir, META_FILENAME), encoding="utf-8") as f:
+            raw = json.load(f)
+        if raw.get("version") != INDEX_VERSION:
+            raise ValueError(f"Versão de índice não suportada: {raw.get('version')}")
+        meta = _IndexMeta(
+            version=raw["version"],
+            documents=[IndexedDocument(*doc) for doc in raw["documents"]],
+            dead=set(raw["dead"]),
+            lexicon=raw["lexicon"],
+            postings_size=raw["postings_size"],
+            by_professor=raw["by_professor"],
+            length_stats=raw.get("length_stats", {}),
+        )
+        index = cls(index_dir, meta)
+        if "length_stats" not in raw:
+            index._recount_lengths()
+        return index
+
+    def _recount_lengths(self) -> None:
+        """
+        Recomputes the per-kind document length totals from the live documents.
+        """
+        stats: dict[str, list[int]] = {}
+        for doc_id, doc in enumerate(self._meta.documents):
+            if doc_id not in self._meta.dead:
+                total = stats.setdefault(doc.kind, [0, 0])
+                total[0] += doc.length
+                total[1] += 1
+        self._meta.length_stats = stats
+
+    def _tombstone(self, key: str) -> None:
+        """
+        Marks a professor's documents as dead and removes them from the length
+        totals.
+
+        Args:
+            key (str): Lattes ID (or name, when the record has no ID).
+        """
+        for doc_id in self._meta.by_professor.pop(key, []):
+            if doc_id in self._meta.dead:
+                continue
+            self._meta.dead.add(doc_id)
+            doc = self._meta.documents[doc_id]
+            total = self._meta.length_stats[doc.kind]
+            total[0] -= doc.length
+            total[1] -= 1
+
+    def _add_documents(
+        self, record: dict, postings: dict[str, list[tuple[int, int]]]
+    ) -> None:
+        """
+        Tokenizes a record's documents and appends them to in-memory postings.
+
+        Args:
+            record (dict): A professor record.
+            postings (dict[str, list[tuple[int, int]]]): Postings being built.
+        """
+        key = _record_key(record)
+        nome = record.get("identificacao", {}).get("nome", "")
+        doc_ids = []
+        for kind, ordinal, text in _documents_from_record(record):
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            doc_id = len(self._meta.documents)
+            # Professor documents are long concatenations; only production
+            # titles are kept so that hits can be displayed without the JSON.
+            stored_text = text if kind == KIND_PRODUCAO else ""
+            self._meta.documents.append(
+                IndexedDocument(kind, key, nome, ordinal, stored_text, len(tokens))
+            )
+            doc_ids.append(doc_id)
+            total = self._meta.length_stats.setdefault(kind, [0, 0])
+            total[0] += len(tokens)
+            total[1] += 1
+            frequencies: dict[str, int] = {}
+            for token in tokens:
+                frequencies[token] = frequencies.get(token, 0) + 1
+            for term, tf in frequencies.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+        self._meta.by_professor[key] = doc_ids
+
+    def _write_postings(self, postings: dict[str, list[tuple[int, int]]]) -> None:
+        """
+        Writes all postings blocks into a new postings file.
+
+        Args:
+            postings (dict[str, list[tuple[int, int]]]): Complete postings.
+        """
+        lexicon: dict[str, list[int]] = {}
+        tmp_path = self._postings_path + ".tmp"
+        offset = 0
+        with open(tmp_path, "wb") as f:
+            for term in sorted(postings):
+                block = _encode_postings(postings[term])
+                f.write(block)
+                lexicon[term] = [offset, len(block), len(postings[term])]
+                offset += len(block)
+        os.replace(tmp_path, self._postings_path)
+        self._meta.lexicon = lexicon
+        self._meta.postings_size = offset
+
+    def _save_meta(self) -> None:
+        """
+        Atomically writes `meta.json`.
+        """
+        raw = {
+            "version": self._meta.version,
+            "documents": [
+                [d.kind, d.lattes_id, d.nome, d.ordinal, d.texto, d.length]
+                for d in self._meta.documents
+            ],
+            "dead": sorted(self._meta.dead),
+            "lexicon": self._meta.lexicon,
+            "postings_size": self._meta.postings_size,
+            "by_professor": self._meta.by_professor,
+            "length_stats": self._meta.length_stats,
+        }
+        path = os.path.join(self.index_dir, META_FILENAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(raw, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def _read_postings(
+        self, terms: list[str], source: mmap.mmap | None = None
+    ) -> dict[str, list[tuple[int, int]]]:
+        """
+        Reads and decodes the postings of the given terms.
+
+        Args:
+            terms (list[str]): Terms to look up; unknown terms are skipped.
+            source (mmap.mmap | None): An already open map of the postings file.
+
+        Returns:
+            dict[str, list[tuple[int, int]]]: Postings per known term.
+        """
+        known = [t for t in terms if t in self._meta.lexicon]
+        if not known or self._meta.postings_size == 0:
+            return {}
+        if source is not None:
+            return {t: self._decode_term(source, t) for t in known}
+        with open(self._postings_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return {t: self._decode_term(mm, t) for t in known}
+
+    def _decode_term(self, mm: mmap.mmap, term: str) -> list[tuple[int, int]]:
+        offset, nbytes, _ = self._meta.lexicon[term]
+        return _decode_postings(mm[offset : offset + nbytes])
+
+    def search(
+        self, query: str, kind: str | None = None, limit: int = 10
+    ) -> list[SearchHit]:
+        """
+        Ranks documents against a free-text query with BM25.
+
+        Args:
+            query (str): Free-text query.
+            kind (str | None): Restrict to "professor" or "producao" documents.
+            limit (int): Maximum number of hits. Defaults to 10.
+
+        Returns:
+            list[SearchHit]: Hits sorted by decreasing score.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        postings = self._read_postings(terms)
+        if not postings:
+            return []
+
+        documents = self._meta.documents
+        dead = self._meta.dead
+        total_docs = len(documents)
+        avg_length = {
+            k: total / count
+            for k, (total, count) in self._meta.length_stats.items()
+            if count
+        }
+
+        scores: dict[int, float] = {}
+        for term, term_postings in postings.items():
+            df = self._meta.lexicon[term][2]
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in term_postings:
+                if doc_id in dead:
+                    continue
+                doc = documents[doc_id]
+                if kind is not None and doc.kind != kind:
+                    continue
+                norm = 1 - BM25_B + BM25_B * doc.length / avg_length[doc.kind]
+                score = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            SearchHit(
+                score=score,
+                kind=documents[doc_id].kind,
+                lattes_id=documents[doc_id].lattes_id,
+                nome=documents[doc_id].nome,
+                ordinal=documents[doc_id].ordinal,
+                texto=documents[doc_id].texto,
+            )
+            for doc_id, score in best
+        ]
+
+    def remove_professor(self, key: str) -> None:
+        """
+        Tombstones every document of a professor.
+
+        Args:
+            key (str): Lattes ID (or name, when the record has no ID).
+        """
+        self._tombstone(key)
+        self._save_meta()
+
+    def update_professor(self, record: dict) -> None:
+        """
+        Replaces a professor's documents without rebuilding the whole index.
+
+        Only the postings of terms present in the new documents are rewritten;
+        their new blocks are appended to the postings file.
+
+        Args:
+            record (dict): The updated professor record.
+        """
+        key = _record_key(record)
+        self._tombstone(key)
+
+        new_postings: dict[str, list[tuple[int, int]]] = {}
+        self._add_documents(record, new_postings)
+
+        with open(self._postings_path, "rb") as f:
+            if self._meta.postings_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    old_postings = self._read_postings(list(new_postings), mm)
+            else:
+                old_postings = {}
+
+        offset = self._meta.postings_size
+        with open(self._postings_path, "r+b") as f:
+            f.seek(offset)
+            for term in sorted(new_postings):
+                merged = old_postings.get(term, []) + new_postings[term]
+                block = _encode_postings(merged)
+                f.write(block)
+                self._meta.lexicon[term] = [offset, len(block), len(merged)]
+                offset += len(block)
+            f.truncate(offset)
+        self._meta.postings_size = offset
+
+        if len(self._meta.dead) > COMPACTION_THRESHOLD * len(self._meta.documents):
+            self.compact()
+        else:
+            self._save_meta()
+
+    def compact(self) -> None:
+        """
+        Drops tombstoned documents and rewrites the postings file contiguously.
+        """
+        dead = self._meta.dead
+        remap: dict[int, int] = {}
+        documents: list[IndexedDocument] = []
+        for doc_id, doc in enumerate(self._meta.documents):
+            if doc_id not in dead:
+                remap[doc_id] = len(documents)
+                documents.append(doc)
+
+        postings = self._read_postings(list(self._meta.lexicon))
+        compacted: dict[str, list[tuple[int, int]]] = {}
+        for term, term_postings in postings.items():
+            alive = [(remap[d], tf) for d, tf in term_postings if d in remap]
+            if alive:
+                compacted[term] = alive
+
+        self._meta.documents = documents
+        self._meta.dead = set()
+        self._meta.by_professor = {
+            key: [remap[d] for d in doc_ids if d in remap]
+            for key, doc_ids in self._meta.by_professor.items()
+        }
+        self._recount_lengths()
+        self._write_postings(compacted)
+        self._save_meta()
+        logging.info(f"Índice compactado ({len(documents)} documentos).")
+
+
+def _load_records(path: str) -> list[dict]:
+    """
+    Loads the JSON list written by parse_profiles.py.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        list[dict]: Professor records.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    """
+    Command-line entry point: builds, updates or queries the index.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Índice invertido (BM25) sobre resumos, projetos e produções."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Constrói o índice.")
+    build_parser.add_argument("--input", required=True, help="JSON de professores.")
+    build_parser.add_argument("--index", required=True, help="Diretório do índice.")
+
+    update_parser = subparsers.add_parser(
+        "update", help="Reindexa um professor a partir do JSON."
+    )
+    update_parser.add_argument("--input", required=True, help="JSON de professores.")
+    update_parser.add_argument("--index", required=True, help="Diretório do índice.")
+    update_parser.add_argument("--lattes-id", required=True, help="ID Lattes.")
+
+    query_parser = subparsers.add_parser("query", help="Consulta o índice.")
+    query_parser.add_argument("--index", required=True, help="Diretório do índice.")
+    query_parser.add_argument("query", help="Texto da consulta.")
+    query_parser.add_argument(
+        "--kind", choices=[KIND_PROFESSOR, KIND_PRODUCAO], default=None
+    )
+    query_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        SearchIndex.build(_load_records(args.input), args.index)
+    elif args.command == "update":
+        records = [
+            r for r in _load_records(args.input) if _record_key(r) == args.lattes_id
+        ]
+        index = SearchIndex.open(args.index)
+        if records:
+            index.update_professor(records[0])
+            logging.info(f"Professor {args.lattes_id} reindexado.")
+        else:
+            index.remove_professor(args.lattes_id)
+            logging.info(f"Professor {args.lattes_id} removido do índice.")
+    else:
+        index = SearchIndex.open(args.index)
+        for hit in index.search(args.query, kind=args.kind, limit=args.limit):
+            print(f"{hit.score:7.3f}  [{hit.kind}] {hit.nome}: {hit.texto[:100]}")
+
+
+if __name__ == "__main__":
+    main()
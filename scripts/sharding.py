@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+
+
+def shard_of(key: str, num_shards: int) -> int:
+    """
+    Assigns a key to one of `num_shards` shards.
+
+    Uses a cryptographic hash rather than hash(), so that every process and
+    machine computes the same assignment.
+
+    Args:
+        key (str): Textual search code (K-code) of the profile, the one key
+            known both before download and after parsing.
+        num_shards (int): Number of shards.
+
+    Returns:
+        int: Shard index in [0, num_shards).
+    """
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """
+    Parses a shard specification such as "2/4" (third of four shards).
+
+    Args:
+        spec (str): "<index>/<count>", with 0 <= index < count.
+
+    Returns:
+        tuple[int, int]: (index, count).
+
+    Raises:
+        argparse.ArgumentTypeError: If the specification is invalid.
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Shard inválido: {spec!r} (use i/N)."
+        ) from None
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard fora do intervalo: {spec!r}.")
+    return index, count
+
+
+def shard_path(path: str, index: int, num_shards: int) -> str:
+    """
+    Derives the output path of a shard from the path of the full output.
+
+    Args:
+        path (str): e.g. "data/professores.json" or "perfis".
+        index (int): Shard index.
+        num_shards (int): Number of shards.
+
+    Returns:
+        str: e.g. "data/professores.shard-2-of-4.json" or "perfis.shard-2-of-4".
+    """
+    root, ext = os.path.splitext(path.rstrip("/\\"))
+    return f"{root}.shard-{index}-of-{num_shards}{ext}"
+
+
+def _record_key(record: dict) -> str:
+    return record["identificacao"].get("lattes_id") or record["identificacao"]["nome"]
+
+
+def merge_records(shards: list[list[dict]]) -> list[dict]:
+    """
+    Combines shard outputs, keeping one record per Lattes ID.
+
+    When the same professor appears more than once (e.g. listed by two
+    institutions), the record with the most productions is kept.
+
+    Args:
+        shards (list[list[dict]]): Records of each shard.
+
+    Returns:
+        list[dict]: Deduplicated records, sorted by professor name.
+    """
+    merged: dict[str, dict] = {}
+    for records in shards:
+        for record in records:
+            key = _record_key(record)
+            current = merged.get(key)
+            if current is None or len(record.get("producao_bibliografica", [])) > len(
+                current.get("producao_bibliografica", [])
+            ):
+                merged[key] = record
+    return sorted(merged.values(), key=lambda x: x["identificacao"]["nome"])
+
+
+def merge_shards(input_paths: list[str], output_path: str) -> int:
+    """
+    Merges shard JSON files into the final dataset.
+
+    Args:
+        input_paths (list[str]): JSON files written by parse_profiles.py --shard.
+        output_path (str): Destination .json path.
+
+    Returns:
+        int: Number of records written.
+    """
+    shards = []
+    for path in input_paths:
+        with open(path, encoding="utf-8") as f:
+            shards.append(json.load(f))
+    merged = merge_records(shards)
+    total = sum(len(records) for records in shards)
+    if total > len(merged):
+        logging.info(f"{total - len(merged)} registros duplicados descartados.")
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, output_path)
+    return len(merged)
+
+
+def spawn_shards(command: list[str], num_shards: int) -> int:
+    """
+    Runs a command once per shard, as parallel local processes.
+
+    Each process receives `--shard i/N` appended to `command`.
+
+    Args:
+        command (list[str]): Command line of download_profile.py or
+            parse_profiles.py, without --shard.
+        num_shards (int): Number of shards.
+
+    Returns:
+        int: 0 if every process succeeded, otherwise the first non-zero code.
+    """
+    processes = [
+        subprocess.Popen([*command, "--shard", f"{index}/{num_shards}"])
+        for index in range(num_shards)
+    ]
+    codes = [process.wait() for process in processes]
+    for index, code in enumerate(codes):
+        if code != 0:
+            logging.error(f"Shard {index}/{num_shards} terminou com código {code}.")
+    return next((code for code in codes if code != 0), 0)
+
+
+def main() -> None:
+    """
+    Command-line entry point: merges shard outputs or runs shards locally.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Combina saídas particionadas (shards) e executa shards locais."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="Combina os JSONs dos shards, sem duplicatas."
+    )
+    merge_parser.add_argument(
+        "--output", required=True, help="JSON final (ex.: data/professores.json)."
+    )
+    merge_parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Número de shards; os arquivos são derivados de --output.",
+    )
+    merge_parser.add_argument(
+        "--inputs", nargs="+", default=None, help="JSONs dos shards (explícitos)."
+    )
+
+    spawn_parser = subparsers.add_parser(
+        "spawn", help="Executa um comando por shard, em processos locais."
+    )
+    spawn_parser.add_argument("--shards", type=int, required=True)
+    spawn_parser.add_argument(
+        "cmd", nargs=argparse.REMAINDER, help="Comando, após '--'."
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "spawn":
+        command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not command:
+            parser.error("Informe o comando após '--'.")
+        sys.exit(spawn_shards(command, args.shards))
+
+    if args.inputs:
+        input_paths = args.inputs
+    elif args.shards:
+        input_paths = [
+            shard_path(args.output, index, args.shards) for index in range(args.shards)
+        ]
+    else:
+        parser.error("Informe --inputs ou --shards.")
+    missing = [path for path in input_paths if not os.path.isfile(path)]
+    if missing:
+        logging.error(f"Shards ausentes: {', '.join(missing)}")
+        sys.exit(1)
+    count = merge_shards(input_paths, args.output)
+    logging.info(f"Dados combinados em '{args.output}' ({count} professores).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from search_index import tokenize
+
+NEIGHBOURS_FILENAME = "neighbours.npz"
+KEYS_FILENAME = "keys.json"
+
+# Rows of the similarity product computed at once; bounds memory to
+# CHUNK_SIZE x n_professors dense floats regardless of corpus size.
+CHUNK_SIZE = 256
+
+
+@dataclass
+class SimilarResearcher:
+    lattes_id: str
+    nome: str
+    score: float
+
+
+def _professor_text(record: dict) -> str:
+    """
+    Concatenates the summary, research project titles and production titles.
+
+    Args:
+        record (dict): A professor record as produced by parse_profiles.py.
+
+    Returns:
+        str: Text describing the professor's research themes.
+    """
+    return " ".join(
+        [record.get("resumo", "")]
+        + [p.get("titulo", "") for p in record.get("projetos_pesquisa", [])]
+        + [p.get("titulo", "") for p in record.get("producao_bibliografica", [])]
+    )
+
+
+def build_tfidf(records: list[dict]) -> sparse.csr_matrix:
+    """
+    Builds L2-normalized sparse TF-IDF vectors, one row per professor.
+
+    Args:
+        records (list[dict]): Professor records.
+
+    Returns:
+        sparse.csr_matrix: Matrix of shape (n_professors, n_terms).
+    """
+    vectorizer = TfidfVectorizer(
+        tokenizer=tokenize,
+        lowercase=False,
+        token_pattern=None,
+        sublinear_tf=True,
+        min_df=1,
+        dtype=np.float32,
+    )
+    matrix = vectorizer.fit_transform([_professor_text(r) for r in records])
+    return sparse.csr_matrix(matrix)
+
+
+def top_k_neighbours(
+    matrix: sparse.csr_matrix, k: int, chunk_size: int = CHUNK_SIZE
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the k most cosine-similar rows of each row, chunk by chunk.
+
+    Args:
+        matrix (sparse.csr_matrix): L2-normalized row vectors.
+        k (int): Number of neighbours per row.
+        chunk_size (int): Rows multiplied per step. Defaults to CHUNK_SIZE.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (indices, scores), both of shape
+        (n_rows, k), sorted by decreasing similarity. Missing slots (when
+        k >= n_rows) are filled with -1 and 0.0.
+    """
+    n_rows = matrix.shape[0]
+    indices = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    k_eff = min(k, n_rows - 1)
+    if k_eff <= 0:
+        return indices, scores
+
+    transposed = matrix.T.tocsc()
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        block = (matrix[start:stop] @ transposed).toarray()
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        candidates = np.argpartition(-block, k_eff - 1, axis=1)[:, :k_eff]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        indices[start:stop, :k_eff] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop, :k_eff] = np.take_along_axis(candidate_scores, order, axis=1)
+    return indices, scores
+
+
+class SimilarityIndex:
+    """
+    Persisted top-k "similar researchers" lookup table.
+
+    The build step is O(n^2 / chunk) in time but O(chunk * n) in memory; after
+    it, each lookup is a dictionary access plus a row read.
+    """
+
+    def __init__(
+        self,
+        keys: list[str],
+        names: list[str],
+        indices: np.ndarray,
+        scores: np.ndarray,
+    ) -> None:
+        self.keys = keys
+        self.names = names
+        self.indices = indices
+        self.scores = scores
+        self._row_of = {key: row for row, key in enumerate(keys)}
+
+    @classmethod
+    def build(cls, records: list[dict], k: int = 10) -> "SimilarityIndex":
+        """
+        Vectorizes the records and computes each professor's neighbours.
+
+        Args:
+            records (list[dict]): Professor records.
+            k (int): Neighbours kept per professor. Defaults to 10.
+
+        Returns:
+            SimilarityIndex: The computed index.
+        """
+        keys = [
+            r["identificacao"].get("lattes_id") or r["identificacao"]["nome"]
+            for r in records
+        ]
+        names = [r["identificacao"]["nome"] for r in records]
+        indices, scores = top_k_neighbours(build_tfidf(records), k)
+        return cls(keys, names, indices, scores)
+
+    def save(self, output_dir: str) -> None:
+        """
+        Writes the neighbour arrays and the key table to a directory.
+
+        Args:
+            output_dir (str): Destination directory.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        np.savez(
+            os.path.join(output_dir, NEIGHBOURS_FILENAME),
+            indices=self.indices,
+            scores=self.scores,
+        )
+        with open(os.path.join(output_dir, KEYS_FILENAME), "w", encoding="utf-8") as f:
+            json.dump({"keys": self.keys, "names": self.names}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, output_dir: str) -> "SimilarityIndex":
+        """
+        Loads an index written by `save`.
+
+        Args:
+            output_dir (str): Directory containing the index files.
+
+        Returns:
+            SimilarityIndex: The loaded index.
+        """
+        with open(os.path.join(output_dir, KEYS_FILENAME), encoding="utf-8") as f:
+            table = json.load(f)
+        with np.load(os.path.join(output_dir, NEIGHBOURS_FILENAME)) as arrays:
+            indices = arrays["indices"]
+            scores = arrays["scores"]
+        return cls(table["keys"], table["names"], indices, scores)
+
+    def similar(self, key: str, limit: int | None = None) -> list[SimilarResearcher]:
+        """
+        Returns the precomputed neighbours of a professor.
+
+        Args:
+            key (str): Lattes ID (or name, when the record has no ID).
+            limit (int | None): Maximum number of neighbours. Defaults to all.
+
+        Returns:
+            list[SimilarResearcher]: Neighbours by decreasing similarity.
+
+        Raises:
+            KeyError: If the professor is not in the index.
+        """
+        row = self._row_of[key]
+        neighbours = [
+            SimilarResearcher(self.keys[j], self.names[j], float(score))
+            for j, score in zip(self.indices[row], self.scores[row])
+            if j >= 0
+        ]
+        return neighbours[:limit]
+
+
+def main() -> None:
+    """
+    Command-line entry point: builds or queries the similarity index.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Pré-calcula os pesquisadores mais similares (TF-IDF + cosseno)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Constrói o índice.")
+    build_parser.add_argument("--input", required=True, help="JSON de professores.")
+    build_parser.add_argument("--output", required=True, help="Diretório de saída.")
+    build_parser.add_argument(
+        "-k", type=int, default=10, help="Vizinhos por professor."
+    )
+
+    query_parser = subparsers.add_parser("query", help="Consulta o índice.")
+    query_parser.add_argument("--index", required=True, help="Diretório do índice.")
+    query_parser.add_argument("lattes_id", help="ID Lattes (ou nome) do professor.")
+    query_parser.add_argument("--limit", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.input, encoding="utf-8") as f:
+            records = json.load(f)
+        index = SimilarityIndex.build(records, k=args.k)
+        index.save(args.output)
+        logging.info(
+            f"Vizinhos salvos em '{args.output}' ({len(records)} professores, k={args.k})."
+        )
+    else:
+        index = SimilarityIndex.load(args.index)
+        try:
+            neighbours = index.similar(args.lattes_id, args.limit)
+        except KeyError:
+            logging.error(f"Professor não encontrado no índice: {args.lattes_id}")
+            return
+        for neighbour in neighbours:
+            print(f"{neighbour.score:.3f}  {neighbour.nome} ({neighbour.lattes_id})")
+
+
+if __name__ == "__main__":
+    main()
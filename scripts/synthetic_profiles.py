@@ -0,0 +1,481 @@
+import argparse
+import logging
+import os
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, fields, replace
+from html import escape
+
+from parse_profiles import extract_professor_data
+from validate_profile import validate_profile
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduardo", "Fernanda", "Gustavo", "Helena",
+    "Igor", "Juliana", "Leonardo", "Mariana", "Nelson", "Patrícia", "Rafael",
+    "Sérgio", "Tatiana", "Vinícius",
+)  # fmt: skip
+SURNAMES = (
+    "Almeida", "Barbosa", "Cavalcanti", "Dantas", "Ferreira", "Gomes", "Lima",
+    "Machado", "Nóbrega", "Oliveira", "Pereira", "Queiroga", "Rocha", "Santos",
+    "Silva", "Souza", "Teixeira", "Vasconcelos",
+)  # fmt: skip
+WORDS = (
+    "análise", "aprendizado", "arquitetura", "avaliação", "computação", "dados",
+    "desempenho", "distribuídos", "educação", "engenharia", "ensino", "imagens",
+    "inteligência", "modelagem", "otimização", "processamento", "redes",
+    "robótica", "segurança", "sistemas", "software", "testes", "visão",
+)  # fmt: skip
+INSTITUTIONS = (
+    "Universidade Federal da Paraíba, UFPB, Brasil.",
+    "Universidade Federal de Campina Grande, UFCG, Brasil.",
+    "Universidade Federal de Pernambuco, UFPE, Brasil.",
+    "Instituto Federal da Paraíba, IFPB, Brasil.",
+)
+FORMATION_LEVELS = ("Doutorado", "Mestrado", "Especialização", "Graduação")
+
+# (anchor, header) of each production subsection, as in real CVs.
+PRODUCTION_TYPES = (
+    ("ArtigosCompletos", "Artigos completos publicados em periódicos"),
+    ("LivrosCapitulos", "Capítulos de livros publicados"),
+    (
+        "TrabalhosPublicadosAnaisCongresso",
+        "Trabalhos completos publicados em anais de congressos",
+    ),
+    (
+        "ResumosPublicadosAnaisCongresso",
+        "Resumos publicados em anais de congressos",
+    ),
+)
+
+
+@dataclass
+class SectionSizes:
+    formacoes: int = 4
+    pos_doutorados: int = 1
+    complementares: int = 5
+    vinculos: int = 3
+    atividades: int = 4
+    projetos_pesquisa: int = 5
+    projetos_extensao: int = 2
+    producoes: int = 40
+    autores: int = 4
+
+    def scaled(self, factor: float) -> "SectionSizes":
+        """
+        Multiplies every section size (but not authors per production).
+
+        Args:
+            factor (float): Scale factor.
+
+        Returns:
+            SectionSizes: The scaled sizes.
+        """
+        return replace(
+            self,
+            **{
+                f.name: max(1, round(getattr(self, f.name) * factor))
+                for f in fields(self)
+                if f.name != "autores"
+            },
+        )
+
+
+def _person(rng: random.Random) -> tuple[str, str]:
+    """
+    Draws a person.
+
+    Returns:
+        tuple[str, str]: Full name and citation name ("SILVA, A. B.").
+    """
+    first, middle = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+    last = rng.choice(SURNAMES)
+    return f"{first} {middle} {last}", f"{last.upper()}, {first[0]}. {middle[0]}."
+
+
+def _title(rng: random.Random, n_words: int = 6) -> str:
+    words = rng.choices(WORDS, k=n_words)
+    return " ".join(words).capitalize()
+
+
+def _period(rng: random.Random) -> tuple[int, int]:
+    start = rng.randint(2000, 2022)
+    return start, rng.randint(start, 2025)
+
+
+def _row(left: str, right: str, subtitle: bool = False) -> str:
+    """
+    Renders one label/value row (layout-cell-3 + layout-cell-9).
+    """
+    extra = " subtit-1" if subtitle else ""
+    return (
+        f'<div class="layout-cell layout-cell-3 text-align-right{extra}">'
+        f'<div class="layout-cell-pad-5 text-align-right"><b>{left}</b></div></div>'
+        f'<div class="layout-cell layout-cell-9">'
+        f'<div class="layout-cell-pad-5">{right}</div></div>'
+    )
+
+
+def _section(anchor: str, title: str, body: str) -> str:
+    return (
+        f'<div class="title-wrapper"><a name="{anchor}"></a><h1>{title}</h1>'
+        '<hr class="separator">'
+        f'<div class="layout-cell layout-cell-12 data-cell">{body}</div>'
+        '<br class="clear"></div>'
+    )
+
+
+def _identificacao(nome: str, citacoes: list[str], lattes_id: str) -> str:
+    return _section(
+        "Identificacao",
+        "Identificação",
+        _row("Nome", escape(nome))
+        + _row("Nome em citações bibliográficas", escape(";".join(citacoes)))
+        + _row("Lattes iD", f"http://lattes.cnpq.br/{lattes_id}")
+        + _row("País de Nacionalidade", "Brasil"),
+    )
+
+
+def _formacoes(rng: random.Random, count: int) -> str:
+    rows = []
+    for i in range(count):
+        start, end = _period(rng)
+        level = FORMATION_LEVELS[i % len(FORMATION_LEVELS)]
+        orientador, _ = _person(rng)
+        rows.append(
+            _row(
+                f"{start} - {end}",
+                f'{level} em {_title(rng, 2)}. <br class="clear">'
+                f"{rng.choice(INSTITUTIONS)}"
+                f'<br class="clear">Título: {_title(rng)}, Ano de obtenção: {end}. '
+                f'<br class="clear">Orientador: {orientador}. ',
+            )
+        )
+    return _section(
+        "FormacaoAcademicaTitulacao", "Formação acadêmica/titulação", "".join(rows)
+    )
+
+
+def _periodos(rng: random.Random, anchor: str, title: str, count: int) -> str:
+    rows = []
+    for _ in range(count):
+        start, end = _period(rng)
+        rows.append(
+            _row(f"{start} - {end}", f"{_title(rng, 4)}. {rng.choice(INSTITUTIONS)}")
+        )
+    return _section(anchor, title, "".join(rows))
+
+
+def _atuacao(rng: random.Random, vinculos: int, atividades: int) -> str:
+    parts = []
+    for _ in range(vinculos):
+        start, _ = _period(rng)
+        parts.append(
+            '<br class="clear">'
+            f'<div class="inst_back"><b>{rng.choice(INSTITUTIONS)}</b></div>'
+            + _row("Vínculo institucional", '<br class="clear">', subtitle=True)
+            + _row(
+                f"{start} - Atual",
+                "Vínculo: Servidor Público, Enquadramento Funcional: Professor do "
+                "Magistério Superior, Carga horária: 40, Regime: Dedicação exclusiva. ",
+            )
+            + _row("Atividades", '<br class="clear">', subtitle=True)
+        )
+        for _ in range(atividades):
+            start, _ = _period(rng)
+            disciplinas = '<br class="clear">'.join(
+                _title(rng, 3) for _ in range(rng.randint(1, 4))
+            )
+            parts.append(
+                _row(
+                    f"{rng.randint(1, 12):02d}/{start} - Atual",
+                    f"Ensino, {_title(rng, 3)}, Nível: Graduação",
+                )
+                + _row(
+                    '<br class="clear">',
+                    f'Disciplinas ministradas<br class="clear">{disciplinas}'
+                    '<br class="clear">',
+                )
+            )
+    return _section("AtuacaoProfissional", "Atuação Profissional", "".join(parts))
+
+
+def _projetos(
+    rng: random.Random, anchor: str, title: str, count: int, coordenador: str
+) -> str:
+    parts = []
+    for _ in range(count):
+        start, _ = _period(rng)
+        titulo = _title(rng)
+        integrantes = " / ".join(
+            [f"{coordenador} - Coordenador"]
+            + [f"{_person(rng)[0]} - Integrante" for _ in range(rng.randint(1, 4))]
+        )
+        parts.append(
+            f'<a name="PP_{escape(titulo)}"></a>'
+            + _row(f"{start} - Atual", f'{titulo}<br class="clear">')
+            + _row(
+                "",
+                f'Descrição: {_title(rng, 20)}. <br class="clear">'
+                "Situação: Em andamento; Natureza: Pesquisa. "
+                f'<br class="clear">Integrantes: {integrantes}.<br class="clear">',
+            )
+        )
+    return _section(anchor, title, "".join(parts))
+
+
+def _producao(
+    rng: random.Random, number: int, owner: str, n_authors: int, artigo: bool
+) -> str:
+    """
+    Renders one `span.transform` production item, in the format the parser
+    splits: "AUTHORS . TITLE. VENUE, v. N, p. A-B, YEAR."
+    """
+    year = rng.randint(2000, 2025)
+    authors = [escape(_person(rng)[1]) for _ in range(max(0, n_authors - 1))]
+    authors.insert(
+        rng.randint(0, len(authors)), f'<b><a class="tooltip">{escape(owner)}</a></b>'
+    )
+    first_page = rng.randint(1, 300)
+    info = (
+        '<span class="informacao-artigo"></span>'
+        f'<span class="informacao-artigo">{authors[0]}</span>'
+        f'<span class="informacao-artigo">{year}</span>'
+        if artigo
+        else ""
+    )
+    item = (
+        '<div class="layout-cell layout-cell-1 text-align-right">'
+        f'<div class="layout-cell-pad-6 text-align-right"><b>{number}. </b></div></div>'
+        '<div class="layout-cell layout-cell-11"><span class="transform">'
+        f"{info}{' ; '.join(authors)} . {_title(rng, 8)}. {_title(rng, 3).upper()}"
+        f"<sup></sup>, v. {rng.randint(1, 60)}, p. {first_page}-{first_page + 12}, "
+        f'{year}. <span class="citado"></span></span></div>'
+        '<br class="clear"><br class="clear">'
+    )
+    return f'<div class="artigo-completo">{item}</div>' if artigo else item
+
+
+def _producoes(rng: random.Random, count: int, owner: str, n_authors: int) -> str:
+    parts = [
+        '<a name="ProducaoBibliografica"></a><br class="clear">'
+        '<div class="inst_back"><b>Produção bibliográfica</b></div>'
+        '<a name="Citacoes"></a><div>'
+    ]
+    n_types = len(PRODUCTION_TYPES)
+    for t, (anchor, header) in enumerate(PRODUCTION_TYPES):
+        # Spread the items over the subsections; the first absorbs the remainder
+        per_type = count // n_types + (count % n_types if t == 0 else 0)
+        if per_type == 0:
+            continue
+        parts.append(
+            f'<div class="cita-artigos"><b><a name="{anchor}"></a>{header}</b></div>'
+            '<br class="clear">'
+        )
+        parts.extend(
+            _producao(rng, i + 1, owner, n_authors, artigo=t == 0)
+            for i in range(per_type)
+        )
+    parts.append("</div>")
+    return _section("ProducoesCientificas", "Produções", "".join(parts))
+
+
+def generate_profile(sizes: SectionSizes | None = None, seed: int | None = None) -> str:
+    """
+    Generates a synthetic CV with the markup of a captured Lattes page.
+
+    The output mirrors what download_profile.py saves: the `infpessoa` header
+    with the Lattes ID span, one `title-wrapper` per section with its anchor,
+    `layout-cell-3`/`layout-cell-9` rows, `inst_back` institution blocks,
+    `cita-artigos` subsection headers, `span.transform` production items and
+    the `rodape-cv` footer.
+
+    Args:
+        sizes (SectionSizes | None): Number of items per section. Defaults to
+            SectionSizes().
+        seed (int | None): Random seed. Defaults to None.
+
+    Returns:
+        str: CV HTML.
+    """
+    sizes = sizes or SectionSizes()
+    rng = random.Random(seed)
+    nome, citacao = _person(rng)
+    lattes_id = "".join(str(rng.randint(0, 9)) for _ in range(16))
+    citacoes = [citacao, citacao.replace(". ", ".").rstrip("."), nome.upper()]
+    resumo = " ".join(_title(rng, 12) + "." for _ in range(5))
+
+    return "".join(
+        [
+            '<div class="infpessoa">'
+            f'<h2 class="nome">{escape(nome)}</h2><ul class="informacoes-autor">'
+            f"<li>Endereço para acessar este CV: http://lattes.cnpq.br/{lattes_id}</li>"
+            '<li>ID Lattes: <span style="font-weight: bold; color: #326C99;">'
+            f"{lattes_id}</span></li>"
+            "<li>Última atualização do currículo em 01/01/2025</li></ul></div>",
+            '<div class="title-wrapper"><hr class="separator">'
+            f'<p class="resumo">{resumo}<span class="texto"> '
+            "(Texto informado pelo autor)</span></p></div>",
+            _identificacao(nome, citacoes, lattes_id),
+            _section(
+                "Endereco",
+                "Endereço",
+                _row(
+                    "Endereço Profissional",
+                    f'{rng.choice(INSTITUTIONS)} <br class="clear">'
+                    "58051900 - João Pessoa, PB - Brasil",
+                ),
+            ),
+            _formacoes(rng, sizes.formacoes),
+            _periodos(
+                rng,
+                "FormacaoAcademicaPosDoutorado",
+                "Pós-doutorado",
+                sizes.pos_doutorados,
+            ),
+            _periodos(
+                rng,
+                "FormacaoComplementar",
+                "Formação Complementar",
+                sizes.complementares,
+            ),
+            _atuacao(rng, sizes.vinculos, sizes.atividades),
+            _projetos(
+                rng,
+                "ProjetosPesquisa",
+                "Projetos de pesquisa",
+                sizes.projetos_pesquisa,
+                nome,
+            ),
+            _projetos(
+                rng,
+                "ProjetosExtensao",
+                "Projetos de extensão",
+                sizes.projetos_extensao,
+                nome,
+            ),
+            _producoes(rng, sizes.producoes, citacao, sizes.autores),
+            '<div class="rodape-cv">Página gerada pelo Sistema Currículo Lattes '
+            "em 01/01/2025 às 00:00:00</div>",
+        ]
+    )
+
+
+@dataclass
+class BenchmarkResult:
+    scale: float
+    size_bytes: int
+    seconds: float
+    peak_memory_bytes: int
+    producoes: int
+    producoes_extraidas: int
+
+
+def benchmark_profile(
+    sizes: SectionSizes, scale: float = 1.0, seed: int = 0
+) -> BenchmarkResult:
+    """
+    Times and measures the peak memory of `extract_professor_data` on one CV.
+
+    The parser runs twice: once untraced for the timing, since tracemalloc
+    slows it down several times, and once traced for the peak memory.
+
+    Args:
+        sizes (SectionSizes): Base section sizes.
+        scale (float): Multiplier applied to the base sizes. Defaults to 1.
+        seed (int): Random seed. Defaults to 0.
+
+    Returns:
+        BenchmarkResult: Measurements, plus the generated and extracted
+        production counts (which should match).
+    """
+    scaled = sizes.scaled(scale)
+    html = generate_profile(scaled, seed)
+    start = time.perf_counter()
+    extracted = extract_professor_data(html)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    extract_professor_data(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return BenchmarkResult(
+        scale=scale,
+        size_bytes=len(html.encode("utf-8")),
+        seconds=seconds,
+        peak_memory_bytes=peak,
+        producoes=scaled.producoes,
+        producoes_extraidas=len(extracted.producao_bibliografica) if extracted else 0,
+    )
+
+
+def _add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    for f in fields(SectionSizes):
+        parser.add_argument(
+            f"--{f.name}",
+            type=int,
+            default=f.default,
+            help=f"Itens de '{f.name}' (padrão: {f.default}).",
+        )
+
+
+def main() -> None:
+    """
+    Command-line entry point: generates synthetic CVs or benchmarks the parser.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Gera currículos Lattes sintéticos para testes de carga do parser."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Gera arquivos HTML.")
+    generate_parser.add_argument("--output", required=True, help="Diretório.")
+    generate_parser.add_argument("--count", type=int, default=10)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    _add_size_arguments(generate_parser)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Mede tempo e memória do parser em escalas crescentes."
+    )
+    bench_parser.add_argument(
+        "--scales", type=float, nargs="+", default=[1, 10, 100], help="Fatores."
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    _add_size_arguments(bench_parser)
+
+    args = parser.parse_args()
+    sizes = SectionSizes(
+        **{f.name: getattr(args, f.name) for f in fields(SectionSizes)}
+    )
+
+    if args.command == "generate":
+        os.makedirs(args.output, exist_ok=True)
+        for i in range(args.count):
+            html = generate_profile(sizes, args.seed + i)
+            validation = validate_profile(html)
+            if not validation.ok:
+                logging.warning(f"Perfil sintético {i} rejeitado: {validation.reason}")
+            path = os.path.join(args.output, f"sintetico_{args.seed + i:05d}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+        logging.info(f"{args.count} currículos sintéticos salvos em '{args.output}'.")
+        return
+
+    print(
+        f"{'escala':>8} {'tamanho':>10} {'tempo (s)':>10} {'itens/s':>10} "
+        f"{'memória':>10} {'produções':>18}"
+    )
+    for scale in args.scales:
+        result = benchmark_profile(sizes, scale, args.seed)
+        print(
+            f"{result.scale:>8g} {result.size_bytes / 2**20:>8.1f}MB "
+            f"{result.seconds:>10.2f} {result.producoes / result.seconds:>10.0f} "
+            f"{result.peak_memory_bytes / 2**20:>8.1f}MB "
+            f"{result.producoes_extraidas:>8}/{result.producoes:<9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
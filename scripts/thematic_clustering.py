@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+from kneed import KneeLocator
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from search_index import tokenize
+
+MATRIX_FILENAME = "tfidf.joblib"
+
+# Parameters that change the fitted models; part of every cache key.
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_N_INIT = 3
+DEFAULT_MAX_ITER = 50
+# Documents sampled for the k-means++ initialization (all, up to this many).
+MAX_INIT_SIZE = 10000
+DEFAULT_SEED = 42
+
+
+@dataclass
+class KSweep:
+    corpus_hash: str
+    ks: list[int]
+    inertias: list[float]
+    knee: int | None
+    labels: dict[int, np.ndarray]
+
+
+def load_titles(path: str) -> list[str]:
+    """
+    Loads production titles from data/titulos_producoes.json or a parsed JSON.
+
+    Args:
+        path (str): {"titulos": [...]} file, or records from parse_profiles.py.
+
+    Returns:
+        list[str]: Titles.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data["titulos"]
+    return [
+        producao["titulo"]
+        for record in data
+        for producao in record.get("producao_bibliografica", [])
+    ]
+
+
+def _title_text(titulo: str) -> str:
+    # Keeps the title proper, dropping venue, volume and pages (as
+    # preprocess_text does in the notebook)
+    return titulo.split(".")[0]
+
+
+def corpus_hash(documents: list[str]) -> str:
+    """
+    Hashes the documents together with the vectorizer configuration.
+
+    Args:
+        documents (list[str]): Corpus.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256(b"tfidf-v1\0")
+    for document in documents:
+        digest.update(document.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class ClusteringCache:
+    """
+    Stores the TF-IDF matrix and fitted models of a corpus on disk.
+
+    Layout: <cache_dir>/<corpus_hash>/tfidf.joblib and one
+    k<k>-<params>.joblib file per fitted model.
+    """
+
+    def __init__(self, cache_dir: str, corpus_hash: str) -> None:
+        self.directory = os.path.join(cache_dir, corpus_hash)
+
+    def _model_path(self, k: int, params: str) -> str:
+        return os.path.join(self.directory, f"k{k}-{params}.joblib")
+
+    def load_matrix(self) -> tuple[TfidfVectorizer, sparse.csr_matrix] | None:
+        path = os.path.join(self.directory, MATRIX_FILENAME)
+        return joblib.load(path) if os.path.exists(path) else None
+
+    def save_matrix(
+        self, vectorizer: TfidfVectorizer, matrix: sparse.csr_matrix
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        joblib.dump((vectorizer, matrix), os.path.join(self.directory, MATRIX_FILENAME))
+
+    def load_model(self, k: int, params: str) -> dict | None:
+        path = self._model_path(k, params)
+        return joblib.load(path) if os.path.exists(path) else None
+
+    def save_model(self, k: int, params: str, fitted: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._model_path(k, params)
+        joblib.dump(fitted, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+
+def build_tfidf(documents: list[str]) -> tuple[TfidfVectorizer, sparse.csr_matrix]:
+    """
+    Vectorizes production titles once, for every k of the sweep.
+
+    Args:
+        documents (list[str]): Production titles.
+
+    Returns:
+        tuple[TfidfVectorizer, sparse.csr_matrix]: Fitted vectorizer and the
+        L2-normalized (n_documents, n_terms) matrix.
+    """
+    vectorizer = TfidfVectorizer(
+        tokenizer=tokenize,
+        lowercase=False,
+        token_pattern=None,
+        min_df=2,
+        dtype=np.float32,
+    )
+    matrix = vectorizer.fit_transform([_title_text(d) for d in documents])
+    return vectorizer, sparse.csr_matrix(matrix)
+
+
+def _fit_k(
+    matrix: sparse.csr_matrix, k: int, batch_size: int, n_init: int, seed: int
+) -> dict:
+    """
+    Fits one MiniBatchKMeans; runs in a worker process.
+    """
+    # On short, sparse titles the defaults (small initialization sample, early
+    # stopping, reassignment of small clusters) mostly end with one giant
+    # cluster; a full initialization sample and fixed epochs avoid that.
+    model = MiniBatchKMeans(
+        n_clusters=k,
+        batch_size=batch_size,
+        n_init=n_init,
+        init_size=min(matrix.shape[0], MAX_INIT_SIZE),
+        max_iter=DEFAULT_MAX_ITER,
+        max_no_improvement=None,
+        reassignment_ratio=0.0,
+        random_state=seed,
+    )
+    labels = model.fit_predict(matrix)
+    return {
+        "model": model,
+        "labels": labels.astype(np.int32),
+        "inertia": model.inertia_,
+    }
+
+
+def sweep_k(
+    documents: list[str],
+    ks: list[int],
+    cache_dir: str | None = None,
+    n_jobs: int = -1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_init: int = DEFAULT_N_INIT,
+    seed: int = DEFAULT_SEED,
+) -> tuple[KSweep, dict[int, MiniBatchKMeans], TfidfVectorizer]:
+    """
+    Fits one MiniBatchKMeans per k in parallel and locates the elbow with kneed.
+
+    The TF-IDF matrix is built once; joblib memory-maps its arrays so that
+    worker processes share it instead of receiving copies. Fitted models are
+    cached by corpus hash and k, so only the missing k values are fitted.
+
+    Args:
+        documents (list[str]): Production titles.
+        ks (list[int]): Candidate numbers of clusters.
+        cache_dir (str | None): Cache directory. Defaults to no caching.
+        n_jobs (int): Worker processes (-1 for all cores). Defaults to -1.
+        batch_size (int): Mini-batch size. Defaults to DEFAULT_BATCH_SIZE.
+        n_init (int): Initializations per k. Defaults to DEFAULT_N_INIT.
+        seed (int): Random seed. Defaults to DEFAULT_SEED.
+
+    Returns:
+        tuple[KSweep, dict[int, MiniBatchKMeans], TfidfVectorizer]: Sweep
+        results, the fitted model of each k, and the vectorizer.
+    """
+    digest = corpus_hash(documents)
+    params = f"b{batch_size}-n{n_init}-i{DEFAULT_MAX_ITER}-s{seed}"
+    cache = ClusteringCache(cache_dir, digest) if cache_dir else None
+
+    cached_matrix = cache.load_matrix() if cache else None
+    if cached_matrix is not None:
+        vectorizer, matrix = cached_matrix
+    else:
+        vectorizer, matrix = build_tfidf(documents)
+        if cache:
+            cache.save_matrix(vectorizer, matrix)
+
+    ks = sorted(set(k for k in ks if 1 < k <= matrix.shape[0]))
+    fitted: dict[int, dict] = {}
+    if cache:
+        for k in ks:
+            model = cache.load_model(k, params)
+            if model is not None:
+                fitted[k] = model
+    missing = [k for k in ks if k not in fitted]
+    if missing:
+        logging.info(f"Ajustando {len(missing)} valores de k ({len(fitted)} em cache).")
+        results = joblib.Parallel(n_jobs=n_jobs, max_nbytes="1M")(
+            joblib.delayed(_fit_k)(matrix, k, batch_size, n_init, seed) for k in missing
+        )
+        for k, result in zip(missing, results):
+            fitted[k] = result
+            if cache:
+                cache.save_model(k, params, result)
+
+    inertias = [float(fitted[k]["inertia"]) for k in ks]
+    knee = None
+    if len(ks) >= 3:
+        # Mini-batch inertias are noisy; the knee is taken on their running
+        # minimum, which is decreasing as kneed expects.
+        envelope = np.minimum.accumulate(inertias)
+        knee = KneeLocator(ks, envelope, curve="convex", direction="decreasing").knee
+    sweep = KSweep(
+        corpus_hash=digest,
+        ks=ks,
+        inertias=inertias,
+        knee=int(knee) if knee is not None else None,
+        labels={k: fitted[k]["labels"] for k in ks},
+    )
+    return sweep, {k: fitted[k]["model"] for k in ks}, vectorizer
+
+
+def top_terms(
+    model: MiniBatchKMeans, vectorizer: TfidfVectorizer, n_terms: int = 8
+) -> list[list[str]]:
+    """
+    Returns the highest-weighted terms of each cluster centroid.
+
+    Args:
+        model (MiniBatchKMeans): Fitted model.
+        vectorizer (TfidfVectorizer): Vectorizer used to build its input.
+        n_terms (int): Terms per cluster. Defaults to 8.
+
+    Returns:
+        list[list[str]]: Terms of each cluster.
+    """
+    terms = vectorizer.get_feature_names_out()
+    order = np.argsort(-model.cluster_centers_, axis=1)[:, :n_terms]
+    return [[terms[i] for i in row] for row in order]
+
+
+def main() -> None:
+    """
+    Command-line entry point: runs the k sweep and describes the chosen k.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description=(
+            "Varre valores de k (MiniBatchKMeans em paralelo sobre TF-IDF) e "
+            "escolhe o cotovelo com kneed."
+        )
+    )
+    parser.add_argument(
+        "--input",
+        required=True,
+        help="data/titulos_producoes.json ou JSON de professores.",
+    )
+    parser.add_argument("--cache", default=None, help="Diretório de cache.")
+    parser.add_argument("--k-min", type=int, default=2)
+    parser.add_argument("--k-max", type=int, default=30)
+    parser.add_argument("--step", type=int, default=1)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Processos.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--terms", type=int, default=8, help="Termos por cluster.")
+    args = parser.parse_args()
+
+    documents = load_titles(args.input)
+    sweep, models, vectorizer = sweep_k(
+        documents,
+        list(range(args.k_min, args.k_max + 1, args.step)),
+        cache_dir=args.cache,
+        n_jobs=args.n_jobs,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    for k, inertia in zip(sweep.ks, sweep.inertias):
+        marker = "  <- cotovelo" if k == sweep.knee else ""
+        print(f"k={k:<4} inércia={inertia:.1f}{marker}")
+    if sweep.knee is None:
+        logging.warning("Nenhum cotovelo encontrado; amplie o intervalo de k.")
+        return
+    sizes = np.bincount(sweep.labels[sweep.knee], minlength=sweep.knee)
+    for cluster, terms in enumerate(
+        top_terms(models[sweep.knee], vectorizer, args.terms)
+    ):
+        print(f"[{cluster}] ({sizes[cluster]} títulos) {', '.join(terms)}")
+
+
+if __name__ == "__main__":
+    main()
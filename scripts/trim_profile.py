@@ -0,0 +1,187 @@
+import argparse
+import logging
+import os
+from dataclasses import asdict
+
+from bs4 import BeautifulSoup, Comment, Tag
+
+from parse_profiles import ProfessorData, extract_professor_data
+
+# Anchors of the sections read by `extract_professor_data`. The production
+# items live under "ProducoesCientificas" (which holds "ProducaoBibliografica").
+KEPT_SECTIONS = frozenset(
+    {
+        "Identificacao",
+        "Endereco",
+        "FormacaoAcademicaTitulacao",
+        "FormacaoAcademicaPosDoutorado",
+        "FormacaoComplementar",
+        "AtuacaoProfissional",
+        "ProjetosPesquisa",
+        "ProjetosExtensao",
+        "ProducoesCientificas",
+    }
+)
+
+# Markup without text the parser could read: scripts, form controls and the
+# images of the citation/JCR widgets. The widgets' text itself is kept, since
+# it ends up in the extracted production titles.
+DROPPED_TAGS = ("script", "style", "noscript", "img", "select", "label", "input")
+
+# Attributes the parser matches on; everything else is dropped.
+KEPT_ATTRIBUTES = frozenset({"class", "name"})
+LATTES_ID_STYLE = "font-weight: bold; color: #326C99;"
+
+
+def _keep_top_level(child: Tag) -> bool:
+    """
+    Tells whether a top-level block of the CV container must be kept.
+
+    Args:
+        child (Tag): A direct child of the CV container.
+
+    Returns:
+        bool: True for the identification header, the summary, the footer
+        and the sections listed in KEPT_SECTIONS.
+    """
+    classes = child.get("class") or []
+    # The footer is kept as the end-of-document marker checked by
+    # validate_profile.py.
+    if "infpessoa" in classes or "rodape-cv" in classes:
+        return True
+    if "title-wrapper" not in classes:
+        return False
+    if child.find("p", class_="resumo") is not None:
+        return True
+    anchor = child.find("a", attrs={"name": True})
+    return isinstance(anchor, Tag) and anchor.get("name") in KEPT_SECTIONS
+
+
+def trim_profile_html(content_html: str) -> str:
+    """
+    Reduces captured CV HTML to the sections and markup the parser consumes.
+
+    Args:
+        content_html (str): Inner HTML of the CV container.
+
+    Returns:
+        str: Trimmed HTML.
+    """
+    soup = BeautifulSoup(content_html, "lxml")
+    root = soup.body if soup.body is not None else soup
+
+    for child in list(root.children):
+        if isinstance(child, Tag) and _keep_top_level(child):
+            continue
+        child.extract()
+
+    for comment in root.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    for tag in root.find_all(DROPPED_TAGS):
+        tag.decompose()
+
+    for tag in root.find_all(True):
+        style = tag.get("style")
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k in KEPT_ATTRIBUTES}
+        if tag.name == "span" and style == LATTES_ID_STYLE:
+            tag["style"] = style
+
+    return root.decode_contents()
+
+
+def _comparable(data: ProfessorData | None) -> dict | None:
+    """
+    Converts extracted data to a dict that ignores citation-name ordering.
+
+    `nomes_citacao` comes from a set, so its order is not meaningful.
+
+    Args:
+        data (ProfessorData | None): Extracted data.
+
+    Returns:
+        dict | None: Comparable representation.
+    """
+    if data is None:
+        return None
+    result = asdict(data)
+    result["identificacao"]["nomes_citacao"] = sorted(
+        result["identificacao"]["nomes_citacao"]
+    )
+    return result
+
+
+def trimmed_matches(content_html: str, trimmed_html: str) -> bool:
+    """
+    Checks that parsing the trimmed HTML yields the same `ProfessorData`.
+
+    Args:
+        content_html (str): Original captured HTML.
+        trimmed_html (str): Output of `trim_profile_html`.
+
+    Returns:
+        bool: True if both documents extract to identical data.
+    """
+    return _comparable(extract_professor_data(content_html)) == _comparable(
+        extract_professor_data(trimmed_html)
+    )
+
+
+def trim_verified(content_html: str) -> str:
+    """
+    Trims the HTML, falling back to the original when extraction would differ.
+
+    Args:
+        content_html (str): Inner HTML of the CV container.
+
+    Returns:
+        str: Trimmed HTML, or the original content if trimming is lossy.
+    """
+    trimmed = trim_profile_html(content_html)
+    if trimmed_matches(content_html, trimmed):
+        return trimmed
+    logging.warning("HTML reduzido difere do original; mantendo o conteúdo completo.")
+    return content_html
+
+
+def main() -> None:
+    """
+    Command-line entry point: trims an existing directory of CV HTML files.
+    """
+    parser = argparse.ArgumentParser(
+        description="Reduz HTMLs de currículos às seções usadas pelo parser."
+    )
+    parser.add_argument("--input", required=True, help="Diretório com arquivos HTML.")
+    parser.add_argument("--output", required=True, help="Diretório de saída.")
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Não compara a extração do HTML reduzido com a do original.",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    html_files = sorted(f for f in os.listdir(args.input) if f.endswith(".html"))
+    original_size = 0
+    trimmed_size = 0
+    mismatches = 0
+    for filename in html_files:
+        with open(os.path.join(args.input, filename), encoding="utf-8") as f:
+            content = f.read()
+        trimmed = trim_profile_html(content)
+        if not args.no_verify and not trimmed_matches(content, trimmed):
+            logging.warning(f"Extração diverge após redução: {filename}")
+            mismatches += 1
+            trimmed = content
+        with open(os.path.join(args.output, filename), "w", encoding="utf-8") as f:
+            f.write(trimmed)
+        original_size += len(content.encode("utf-8"))
+        trimmed_size += len(trimmed.encode("utf-8"))
+
+    logging.info(
+        f"{len(html_files)} arquivos reduzidos de {original_size / 1024:.0f} KB "
+        f"para {trimmed_size / 1024:.0f} KB ({mismatches} divergências)."
+    )
+
+
+if __name__ == "__main__":
+    main()
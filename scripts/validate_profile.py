@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+# Expected size of a captured CV container (trimmed captures start at ~9 KB,
+# full ones at ~17 KB; the largest bundled profile is ~400 KB).
+MIN_SIZE = 4 * 1024
+MAX_SIZE = 32 * 1024 * 1024
+
+# Section anchors present in every CV, whatever its content.
+REQUIRED_ANCHORS = ("Identificacao", "FormacaoAcademicaTitulacao")
+
+REASON_OK = "ok"
+REASON_TOO_SMALL = "too_small"
+REASON_TOO_LARGE = "too_large"
+REASON_CAPTCHA = "captcha"
+REASON_MISSING_NAME = "missing_name"
+REASON_MISSING_SECTIONS = "missing_sections"
+REASON_TRUNCATED = "truncated"
+
+QUARANTINE_MANIFEST = "quarantine.jsonl"
+
+_NAME_MARKER = b'<h2 class="nome"'
+_FOOTER_MARKER = b'class="rodape-cv"'
+_CAPTCHA_MARKER = b"captcha"
+
+# A single alternation so that every marker is found in one pass over the bytes.
+_MARKERS = re.compile(
+    rb"<h2 class=\"nome\""
+    rb"|class=\"rodape-cv\""
+    rb"|<a name=\"(" + "|".join(REQUIRED_ANCHORS).encode("ascii") + rb")\""
+    rb"|(?i:captcha)"
+)
+
+
+@dataclass
+class ValidationResult:
+    ok: bool
+    reason: str
+    size: int
+
+
+def validate_profile(content: str | bytes) -> ValidationResult:
+    """
+    Checks captured CV HTML for the markers the parser relies on, without parsing.
+
+    The document must fall within the expected size bounds and contain the
+    `h2.nome` header, every anchor in REQUIRED_ANCHORS and the CV footer
+    (missing footer means the capture was truncated). Documents lacking those
+    markers but mentioning a captcha are reported as captcha pages.
+
+    Args:
+        content (str | bytes): Captured HTML.
+
+    Returns:
+        ValidationResult: Whether the document is usable, and why not.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    size = len(data)
+    if size < MIN_SIZE:
+        reason = REASON_CAPTCHA if _CAPTCHA_MARKER in data.lower() else REASON_TOO_SMALL
+        return ValidationResult(False, reason, size)
+    if size > MAX_SIZE:
+        return ValidationResult(False, REASON_TOO_LARGE, size)
+
+    has_name = False
+    has_footer = False
+    has_captcha = False
+    anchors: set[bytes] = set()
+    for match in _MARKERS.finditer(data):
+        marker = match.group(0)
+        if match.group(1):
+            anchors.add(match.group(1))
+        elif marker == _NAME_MARKER:
+            has_name = True
+        elif marker == _FOOTER_MARKER:
+            has_footer = True
+        else:
+            has_captcha = True
+
+    if has_name and has_footer and len(anchors) == len(REQUIRED_ANCHORS):
+        return ValidationResult(True, REASON_OK, size)
+    if has_captcha:
+        return ValidationResult(False, REASON_CAPTCHA, size)
+    if not has_name:
+        return ValidationResult(False, REASON_MISSING_NAME, size)
+    if len(anchors) < len(REQUIRED_ANCHORS):
+        return ValidationResult(False, REASON_MISSING_SECTIONS, size)
+    return ValidationResult(False, REASON_TRUNCATED, size)
+
+
+def quarantine_profile(
+    content: str, label: str, reason: str, quarantine_dir: str
+) -> str:
+    """
+    Stores a rejected document and records the reason in the quarantine manifest.
+
+    Args:
+        content (str): Rejected HTML.
+        label (str): Identifier of the document (file name or professor name).
+        reason (str): Reason code returned by `validate_profile`.
+        quarantine_dir (str): Quarantine directory.
+
+    Returns:
+        str: Path of the quarantined copy.
+    """
+    os.makedirs(quarantine_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(label))[0]
+    path = os.path.join(quarantine_dir, f"{base}.{reason}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    entry = {
+        "label": label,
+        "reason": reason,
+        "size": len(content.encode("utf-8")),
+        "path": path,
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
+    with open(
+        os.path.join(quarantine_dir, QUARANTINE_MANIFEST), "a", encoding="utf-8"
+    ) as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    logging.warning(f"Documento em quarentena ({reason}): {label} -> {path}")
+    return path